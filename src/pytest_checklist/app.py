@@ -1,9 +1,14 @@
 """Stuff for dealing with configuration, inputs, etc."""
 
+import heapq
+from collections import defaultdict, deque
 from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, TypeVar
 
 from pytest_checklist.collector import TargetResult
 
+T = TypeVar("T")
+
 
 @dataclass
 class TargetReport:
@@ -12,6 +17,46 @@ class TargetReport:
     passes: bool
 
 
+@dataclass
+class CoverageCounts:
+    """Running tallies of target reports for some group of targets."""
+
+    num_targets: int = 0
+    num_passes: int = 0
+    num_ignored: int = 0
+
+    def add(self, report: TargetReport) -> None:
+
+        if report.result.target.ignored:
+            self.num_ignored += 1
+        else:
+            self.num_targets += 1
+
+        if report.passes:
+            self.num_passes += 1
+
+    def merge(self, other: "CoverageCounts") -> None:
+
+        self.num_targets += other.num_targets
+        self.num_passes += other.num_passes
+        self.num_ignored += other.num_ignored
+
+    def percent_passes(self) -> float:
+
+        if self.num_passes == self.num_targets:
+            return 100.0
+        elif self.num_passes > 0:
+            return (self.num_passes / self.num_targets) * 100
+        else:
+            return 0.0
+
+    def is_passing(self, percent_pass_threshold: float) -> tuple[float, bool]:
+
+        percent_passes = self.percent_passes()
+
+        return percent_passes, percent_passes >= percent_pass_threshold
+
+
 def resolve_exclude_patterns(exclude_str: str) -> set[str]:
     if len(exclude_str) == 0:
         return set()
@@ -21,21 +66,138 @@ def resolve_exclude_patterns(exclude_str: str) -> set[str]:
 
 
 def is_passing(
-    reports: list[TargetReport],
+    reports: Iterable[TargetReport],
     percent_pass_threshold: float,
 ) -> tuple[float, bool]:
 
-    num_targets = sum([1 for report in reports if not report.result.target.ignored])
+    counts = CoverageCounts()
+    for report in reports:
+        counts.add(report)
 
-    total_passes = sum([1 if report.passes else 0 for report in reports])
+    return counts.is_passing(percent_pass_threshold)
+
+
+def iter_target_reports(
+    results: Iterable[TargetResult],
+    target_min_pass: int,
+) -> Iterator[TargetReport]:
+    """Lazily decide whether each target passes."""
+
+    for result in results:
+        yield TargetReport(result, passes=result.num_pointers >= target_min_pass)
+
+
+class ReportAccumulator:
+    """Consumes target reports keeping only bounded summaries of them.
+
+    Tallies the counts for the pass threshold, optionally per module,
+    and keeps the `num_worst` failing targets with the fewest pointers.
+    The time taken by the pointing tests is added up per module.
+
+    """
+
+    def __init__(self, num_worst: int = 0, track_modules: bool = False):  # nochecklist:
+
+        self.num_worst = num_worst
+        self.track_modules = track_modules
+
+        self.counts = CoverageCounts()
+        self.module_counts: dict[str, CoverageCounts] = defaultdict(CoverageCounts)
+        self.module_durations: dict[str, float] = defaultdict(float)
+
+        # candidates for the worst failures, trimmed down whenever it
+        # doubles in size so that it stays bounded
+        self._worst: list[TargetReport] = []
+
+    def add(self, report: TargetReport) -> None:
+
+        self.counts.add(report)
+
+        if self.track_modules:
+            self.module_counts[report.result.target.module.fq_module_name].add(report)
+
+        if report.result.total_duration > 0:
+            self.module_durations[
+                report.result.target.module.fq_module_name
+            ] += report.result.total_duration
+
+        if (
+            self.num_worst > 0
+            and not report.passes
+            and not report.result.target.ignored
+        ):
+
+            self._worst.append(report)
+
+            if len(self._worst) >= 2 * self.num_worst:
+                self._worst = heapq.nsmallest(
+                    self.num_worst, self._worst, key=failure_rank
+                )
+
+    def worst_failures(self) -> list[TargetReport]:
+        """The kept failures, fewest pointers first then by name."""
+
+        return heapq.nsmallest(self.num_worst, self._worst, key=failure_rank)
+
+
+def failure_rank(report: TargetReport) -> tuple[int, str]:
+    """Sort key putting the targets furthest from passing first."""
+
+    return report.result.num_pointers, report.result.target.fq_name()
+
+
+def rollup_packages(
+    module_counts: dict[str, CoverageCounts],
+) -> dict[str, CoverageCounts]:
+    """Sum the module tallies into every enclosing package.
+
+    The result is keyed by every dotted prefix of the module names
+    (including the modules themselves).
+
+    """
+
+    package_counts: dict[str, CoverageCounts] = defaultdict(CoverageCounts)
+
+    for fq_module_name, counts in module_counts.items():
+
+        parts = fq_module_name.split(".")
+        for idx in range(1, len(parts) + 1):
+            package_counts[".".join(parts[:idx])].merge(counts)
+
+    return dict(package_counts)
+
+
+def worst_modules(
+    module_counts: dict[str, CoverageCounts],
+    num_modules: int,
+) -> list[str]:
+    """Names of the lowest covered modules which are not fully passing.
+
+    Ties in the percentage are broken by the number of failing targets
+    so that the largest gaps come first.
+
+    """
+
+    failing = (
+        (counts.percent_passes(), counts.num_passes - counts.num_targets, name)
+        for name, counts in module_counts.items()
+        if counts.num_passes < counts.num_targets
+    )
+
+    return [name for _, _, name in heapq.nsmallest(num_modules, failing)]
+
+
+def tap(items: Iterable[T], sinks: list[Callable[[T], None]]) -> Iterator[T]:
+    """Pass each item to all the sinks as it is iterated over."""
+
+    for item in items:
+        for sink in sinks:
+            sink(item)
+
+        yield item
 
-    if total_passes == num_targets:
-        percent_passes = 100.0
-    elif total_passes > 0:
-        percent_passes = (total_passes / num_targets) * 100
-    else:
-        percent_passes = 0.0
 
-    passes = percent_passes >= percent_pass_threshold
+def drain(items: Iterable[T]) -> None:
+    """Exhaust an iterator without keeping any of the items."""
 
-    return percent_passes, passes
+    deque(items, maxlen=0)
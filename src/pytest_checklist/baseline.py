@@ -0,0 +1,78 @@
+"""Ratchet the coverage against the target statuses of a previous run."""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+PASS_STATUS = "PASS"  # noqa: S105
+FAIL_STATUS = "FAIL"
+
+
+@dataclass
+class BaselineRegressions:
+
+    # targets which were passing in the baseline but not anymore
+    lost: list[str] = field(default_factory=list)
+
+    # targets not in the baseline which aren't passing
+    new_failing: list[str] = field(default_factory=list)
+
+    def passes(self) -> bool:
+        return len(self.lost) == 0 and len(self.new_failing) == 0
+
+
+def write_baseline(path: Path, statuses: Iterable[tuple[str, bool]]) -> None:
+    """Write the sorted statuses one target per line."""
+
+    with open(path, "w") as baseline_file:
+        baseline_file.writelines(
+            f"{name}\t{PASS_STATUS if passes else FAIL_STATUS}\n"
+            for name, passes in statuses
+        )
+
+
+def read_baseline(path: Path) -> Iterator[tuple[str, bool]]:
+    """Stream the statuses from a baseline file, in the order they are stored."""
+
+    with open(path) as baseline_file:
+        for line in baseline_file:
+
+            line = line.rstrip("\n")
+            if len(line) == 0:
+                continue
+
+            name, _, status = line.partition("\t")
+
+            if status not in (PASS_STATUS, FAIL_STATUS):
+                raise ValueError(f"Invalid status for {name} in baseline {path}")
+
+            yield name, status == PASS_STATUS
+
+
+def compare_baseline(
+    baseline: Iterable[tuple[str, bool]],
+    current: Iterable[tuple[str, bool]],
+) -> BaselineRegressions:
+    """Find the regressions with a merge-join of the two sorted statuses."""
+
+    regressions = BaselineRegressions()
+
+    baseline_it = iter(baseline)
+    old = next(baseline_it, None)
+
+    for name, passes in current:
+
+        # skip over the targets that have been removed since
+        while old is not None and old[0] < name:
+            old = next(baseline_it, None)
+
+        if passes:
+            continue
+
+        elif old is None or old[0] != name:
+            regressions.new_failing.append(name)
+
+        elif old[1]:
+            regressions.lost.append(name)
+
+    return regressions
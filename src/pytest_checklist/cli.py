@@ -0,0 +1,255 @@
+"""Command line interface for working with checklist targets outside of pytest."""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+from pathlib import Path
+
+from rich.console import Console
+
+from pytest_checklist.app import resolve_exclude_patterns
+from pytest_checklist.daemon import TargetIndexServer
+from pytest_checklist.defaults import (
+    DEFAULT_DAEMON_POLL_INTERVAL,
+    DEFAULT_DAEMON_SOCKET,
+    DEFAULT_INVENTORY_PATH,
+    DEFAULT_MATRIX_PATH,
+)
+from pytest_checklist.inventory import (
+    Inventory,
+    load_inventory,
+    scan_source,
+    write_inventory,
+)
+from pytest_checklist.matrix import load_matrix, minimal_test_set
+from pytest_checklist.path_utils import resolve_module_search_path
+
+
+def scan(
+    source_dir: Path,
+    exclude: str = "",
+    infer_search_module: bool = True,
+    jobs: int = 1,
+    previous: Inventory | None = None,
+) -> Inventory:
+    """Detect, resolve and scan all the targets under the source directory."""
+
+    return scan_source(
+        source_dir,
+        list(resolve_exclude_patterns(exclude)),
+        resolve_module_search_path(source_dir, infer_search_module),
+        previous=previous,
+        jobs=jobs,
+    )
+
+
+def scan_command(args: argparse.Namespace) -> int:  # nochecklist: CLI glue
+
+    console = Console(stderr=True)
+
+    output = Path(args.output)
+
+    previous = None
+    if args.cache and output.exists():
+        try:
+            previous = load_inventory(output)
+        except (ValueError, KeyError) as err:
+            console.print(f"[yellow]Not reusing inventory {output}: {err}[/yellow]")
+
+    try:
+        inventory = scan(
+            Path(args.collect).resolve(),
+            exclude=args.exclude,
+            infer_search_module=args.infer_search_module,
+            jobs=args.jobs,
+            previous=previous,
+        )
+    except ValueError as err:
+        console.print(f"[red]{err}[/red]")
+        return 1
+
+    write_inventory(output, inventory)
+
+    targets = [
+        target
+        for module_targets in inventory.targets().values()
+        for target in module_targets
+    ]
+
+    if args.list_ignored:
+        for name in sorted(target.fq_name() for target in targets if target.ignored):
+            print(name)
+
+    console.print(
+        f"Wrote {len(targets)} targets from {len(inventory.modules)} modules to {output}"
+    )
+
+    return 0
+
+
+def serve_command(args: argparse.Namespace) -> int:  # nochecklist: CLI glue
+
+    console = Console(stderr=True)
+
+    socket_path = Path(args.socket)
+
+    try:
+        server = TargetIndexServer(socket_path, poll_interval=args.poll_interval)
+    except RuntimeError as err:
+        console.print(f"[red]{err}[/red]")
+        return 1
+
+    # shutdown has to be called from another thread than the one serving
+    signal.signal(
+        signal.SIGTERM,
+        lambda *_: threading.Thread(target=server.shutdown).start(),
+    )
+
+    console.print(f"Serving checklist targets on {socket_path}")
+
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        console.print("Stopped checklist daemon")
+
+    return 0
+
+
+def matrix_command(args: argparse.Namespace) -> int:  # nochecklist: CLI glue
+
+    matrix = load_matrix(Path(args.matrix))
+
+    if args.tests_for is not None:
+        names = matrix.tests_for_target(args.tests_for)
+    elif args.targets_for is not None:
+        names = matrix.targets_for_test(args.targets_for)
+    else:
+        names = minimal_test_set(matrix)
+
+    for name in names:
+        print(name)
+
+    return 0
+
+
+def make_parser() -> argparse.ArgumentParser:  # nochecklist: CLI glue
+
+    parser = argparse.ArgumentParser(
+        prog="pytest-checklist",
+        description="Tools for pytest-checklist that don't need a pytest session.",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = subparsers.add_parser(
+        "scan",
+        help="Scan the source code for targets and write an inventory for `--checklist-inventory`.",
+    )
+    scan_parser.set_defaults(func=scan_command)
+    scan_parser.add_argument(
+        "--collect",
+        default=".",
+        help="Directory to gather targets from, like `--checklist-collect`. Default: '.'",
+    )
+    scan_parser.add_argument(
+        "--exclude",
+        default="",
+        help="Source files to exclude from collection, comma separated glob patterns.",
+    )
+    scan_parser.add_argument(
+        "--infer-search-module",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=(
+            "Infer the module search path, like `--checklist-infer-search-module`. "
+            "With `--no-infer-search-module` it is taken from `sys.path`, which "
+            "doesn't have the current directory for a console script. Default: infer"
+        ),
+    )
+    scan_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes to parse the source files with. Default: number of CPUs",
+    )
+    scan_parser.add_argument(
+        "-o",
+        "--output",
+        default=DEFAULT_INVENTORY_PATH,
+        help=f"File to write the inventory to. Default: '{DEFAULT_INVENTORY_PATH}'",
+    )
+    scan_parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        action="store_false",
+        default=True,
+        help="Parse every file again instead of reusing unchanged modules from an existing output file.",
+    )
+    scan_parser.add_argument(
+        "--list-ignored",
+        action="store_true",
+        default=False,
+        help="Print the fully-qualified names of the targets ignored with `nochecklist:`.",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run a daemon keeping the targets scanned for `--checklist-daemon-socket`.",
+    )
+    serve_parser.set_defaults(func=serve_command)
+    serve_parser.add_argument(
+        "--socket",
+        default=DEFAULT_DAEMON_SOCKET,
+        help=f"Path of the Unix socket to listen on. Default: '{DEFAULT_DAEMON_SOCKET}'",
+    )
+    serve_parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_DAEMON_POLL_INTERVAL,
+        help=f"Seconds between checking the source files for changes. Default: {DEFAULT_DAEMON_POLL_INTERVAL}",
+    )
+
+    matrix_parser = subparsers.add_parser(
+        "matrix",
+        help="Query a matrix written with `--checklist-matrix`.",
+    )
+    matrix_parser.set_defaults(func=matrix_command)
+    matrix_parser.add_argument(
+        "matrix",
+        nargs="?",
+        default=DEFAULT_MATRIX_PATH,
+        help=f"Matrix file to query. Default: '{DEFAULT_MATRIX_PATH}'",
+    )
+    query_group = matrix_parser.add_mutually_exclusive_group()
+    query_group.add_argument(
+        "--tests-for",
+        metavar="TARGET",
+        help="Print the tests pointing to a fully-qualified target.",
+    )
+    query_group.add_argument(
+        "--targets-for",
+        metavar="NODEID",
+        help="Print the targets a test points to.",
+    )
+    query_group.add_argument(
+        "--minimal",
+        action="store_true",
+        default=False,
+        help="Print a small set of tests pointing to every target in the matrix. This is the default.",
+    )
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:  # nochecklist: CLI glue
+
+    args = make_parser().parse_args(argv)
+
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,42 +1,236 @@
-from typing import Union, Iterable
-from dataclasses import dataclass
+import ast
+from typing import Union, Iterable, Iterator, Mapping, TextIO
+from dataclasses import dataclass, field
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
-import libcst as cst
-from libcst.metadata import QualifiedNameProvider, ParentNodeProvider
+from pytest_checklist.defaults import (
+    DEFAULT_NO_COVER_FILE_TOKEN,
+    DEFAULT_NO_COVER_MODULE_TOKEN,
+)
 
-from pytest_checklist.defaults import DEFAULT_NO_COVER_TOKEN
 
+class AliasCollector(ast.NodeVisitor):
+    """Collects the aliases defined in a module from its `ast`.
 
-class MethodQualNamesCollector(cst.CSTVisitor):
-    """Collector using the CST library visitor pattern."""
+    Aliases are re-exports with `from ... import` at the top level of
+    the module and plain renames like `foo = bar` or `foo = Some.bar`
+    in the module or a class. Parsing with `ast` is much cheaper than
+    with libcst, so the aliases can be found ahead of the targets.
 
-    METADATA_DEPENDENCIES = (QualifiedNameProvider, ParentNodeProvider)
+    """
 
-    def __init__(self):  # nochecklist:
-        self.found = set()
-        self.ignored = set()
-        super().__init__()
+    def __init__(self, fq_module_name: str = ""):  # nochecklist:
+
+        self.fq_module_name = fq_module_name
+
+        # the functions defined in the module and its classes
+        self.found: set[str] = set()
 
-    def visit_FunctionDef(self, node: cst.FunctionDef):  # nochecklist: TODO
+        # the prefix of the names in the current scope, '' for the module
+        self._scope = ""
 
-        header = getattr(node.body, "header", None)
-        ignored = (
-            header is not None
-            and header.comment
-            and header.comment.value.find(DEFAULT_NO_COVER_TOKEN) > -1
+        # whether each name of each scope is imported and what it is
+        self._bindings: dict[str, dict[str, set[tuple[bool, str]]]] = defaultdict(
+            lambda: defaultdict(set)
         )
 
-        # TODO: Find better way to remove locals
-        qual_names = self.get_metadata(QualifiedNameProvider, node)
-        for qn in qual_names:
-            from_local = qn.name.find("<locals>") > -1
-            if not from_local:
+        # in order, the local alias names with the name they refer to
+        # and, for renames, the scope to look the name up in
+        self._aliases: list[tuple[str, str, str | None]] = []
+
+        super().__init__()
+
+    def bind(self, local_name: str, name: str, imported: bool = False) -> None:
+        """Record what a name of the current scope may refer to."""
+
+        self._bindings[self._scope][local_name].add((imported, name))
+
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+
+        self.found.add(f"{self._scope}{node.name}")
+        self.bind(node.name, f"{self._scope}{node.name}")
+
+        # nothing in a function body is an alias
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+
+        self.bind(node.name, f"{self._scope}{node.name}")
+
+        outer_scope = self._scope
+        self._scope = f"{outer_scope}{node.name}."
+
+        self.generic_visit(node)
+
+        self._scope = outer_scope
+
+    def visit_Name(self, node: ast.Name) -> None:
+
+        if isinstance(node.ctx, ast.Store):
+            self.bind(node.id, f"{self._scope}{node.id}")
+
+    def visit_Import(self, node: ast.Import) -> None:
+
+        for import_alias in node.names:
+
+            if import_alias.asname is not None:
+                self.bind(import_alias.asname, import_alias.name, imported=True)
+            else:
+                top_name = import_alias.name.partition(".")[0]
+                self.bind(top_name, top_name, imported=True)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+
+        from_module = "." * node.level + (node.module or "")
+
+        for import_alias in node.names:
+
+            if import_alias.name == "*":
+                continue
+
+            local_name = import_alias.asname or import_alias.name
+
+            if from_module.endswith("."):
+                imported_name = f"{from_module}{import_alias.name}"
+            else:
+                imported_name = f"{from_module}.{import_alias.name}"
+
+            self.bind(local_name, imported_name, imported=True)
+
+            # imports in classes aren't re-exported
+            if self._scope == "":
+                self._aliases.append((local_name, imported_name, None))
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+
+        self.generic_visit(node)
+
+        # only plain renames like `foo = bar` or `foo = Some.bar`
+        if len(node.targets) != 1 or not isinstance(node.targets[0], ast.Name):
+            return
+
+        value_name = dotted_name(node.value)
+        if value_name is not None:
+            self._aliases.append(
+                (f"{self._scope}{node.targets[0].id}", value_name, self._scope)
+            )
+
+    def skip(self, node: ast.AST) -> None:
+        """Don't look in nodes with their own scope."""
+
+    visit_Lambda = skip
+    visit_ListComp = skip
+    visit_SetComp = skip
+    visit_DictComp = skip
+    visit_GeneratorExp = skip
+
+    def resolve(self, name: str, scope: str) -> str | None:
+        """The fully-qualified name a name in a scope refers to, if known.
+
+        A name both imported and defined in the module, e.g. as a
+        fallback, refers to the definition.
+
+        """
+
+        base, _, rest = name.partition(".")
+
+        # names in a class body are looked up there first, then globally
+        bindings = self._bindings[scope].get(base) or self._bindings[""].get(base)
+
+        # e.g. builtins
+        if not bindings:
+            return None
+
+        imported, bound_name = min(bindings)
+
+        if rest != "":
+            bound_name = f"{bound_name}.{rest}"
+
+        if imported:
+            return resolve_relative_name(bound_name, self.fq_module_name)
+
+        return f"{self.fq_module_name}.{bound_name}"
 
-                self.found.add(qn.name)
-                if ignored:
-                    self.ignored.add(qn.name)
+    def aliases(self) -> dict[str, str]:
+        """The fully-qualified alias names to the names they refer to."""
+
+        aliases = {}
+        for local_name, name, scope in self._aliases:
+
+            resolved: str | None
+            if scope is None:
+                resolved = resolve_relative_name(name, self.fq_module_name)
+            else:
+                resolved = self.resolve(name, scope)
+
+            fq_alias = alias_name(local_name, self.fq_module_name)
+
+            # submodules imported into their package are the same name
+            if resolved is not None and resolved != fq_alias:
+                aliases[fq_alias] = resolved
+
+        # a function defined next to an import or assignment of the same
+        # name, e.g. a fallback when the import fails, is its own target
+        for name in self.found:
+            aliases.pop(alias_name(name, self.fq_module_name), None)
+
+        return aliases
+
+
+def dotted_name(node: ast.expr) -> str | None:
+    """The name of a plain name or attribute chain like `a.b.c`."""
+
+    if isinstance(node, ast.Name):
+        return node.id
+
+    if isinstance(node, ast.Attribute):
+        base = dotted_name(node.value)
+        if base is not None:
+            return f"{base}.{node.attr}"
+
+    return None
+
+
+def collect_aliases(source: str, fq_module_name: str) -> dict[str, str]:
+    """The aliases defined in the source of a module."""
+
+    collector = AliasCollector(fq_module_name)
+    collector.visit(ast.parse(source))
+
+    return collector.aliases()
+
+
+def module_namespace(fq_module_name: str) -> str:
+    """The name the things defined in a module are imported from."""
+
+    # names in a package `__init__` are imported from the package itself
+    return fq_module_name.removesuffix(".__init__")
+
+
+def alias_name(local_name: str, fq_module_name: str) -> str:
+    """The fully-qualified name an alias defined in a module is imported as."""
+
+    return f"{module_namespace(fq_module_name)}.{local_name}"
+
+
+def resolve_relative_name(name: str, fq_module_name: str) -> str:
+    """Make an imported name, which may be relative, absolute."""
+
+    num_dots = len(name) - len(name.lstrip("."))
+    if num_dots == 0:
+        return name
+
+    # relative to the package of the module, which for a package
+    # `__init__` module is the package itself
+    package_parts = fq_module_name.split(".")[:-1]
+
+    # every dot after the first goes up one package
+    base_parts = package_parts[: len(package_parts) - (num_dots - 1)]
+
+    return ".".join([*base_parts, name[num_dots:]])
 
 
 def detect_files(
@@ -100,30 +294,289 @@ def resolve_fq_modules(
     return modules
 
 
+@dataclass
+class ModuleScan:
+
+    targets: set[Target] = field(default_factory=set)
+
+    # fully-qualified alias names to the names they refer to
+    aliases: dict[str, str] = field(default_factory=dict)
+
+
+def read_header(source_file: TextIO) -> list[str]:
+    """Read the lines of the file up to and including the first line of code.
+
+    Only comments and blank lines are part of the header.
+
+    """
+
+    lines = []
+    for line in source_file:
+
+        lines.append(line)
+
+        stripped = line.strip()
+        if stripped != "" and not stripped.startswith("#"):
+            break
+
+    return lines
+
+
+def header_pragmas(header: list[str]) -> set[str]:
+    """Which of the module and file pragmas are in the header comments."""
+
+    comments = "".join(line for line in header if line.lstrip().startswith("#"))
+
+    return {
+        token
+        for token in (DEFAULT_NO_COVER_MODULE_TOKEN, DEFAULT_NO_COVER_FILE_TOKEN)
+        if comments.find(token) > -1
+    }
+
+
+def read_module_source(module: Module) -> tuple[str, set[str]] | None:
+    """The source of a module and its header pragmas.
+
+    Modules with the file pragma are skipped after only reading the
+    header.
+
+    """
+
+    with open(module.path) as source_file:
+
+        header = read_header(source_file)
+        pragmas = header_pragmas(header)
+
+        if DEFAULT_NO_COVER_FILE_TOKEN in pragmas:
+            return None
+
+        return "".join(header) + source_file.read(), pragmas
+
+
+def scan_aliases(module: Module) -> dict[str, str]:
+    """Only collect the aliases in a module, without parsing it with libcst."""
+
+    module_source = read_module_source(module)
+    if module_source is None:
+        return {}
+
+    return collect_aliases(module_source[0], module.fq_module_name)
+
+
+def scan_module(module: Module) -> ModuleScan:
+    """Parse a single module and collect the targets and aliases in it.
+
+    Modules with the file pragma in their header are skipped, ones with
+    the module pragma have all their targets ignored.
+
+    """
+
+    module_source = read_module_source(module)
+    if module_source is None:
+        return ModuleScan()
+
+    source, pragmas = module_source
+
+    # libcst is slow to import, so only when something is parsed with it
+    from pytest_checklist.parsing import collect_method_names
+
+    found, ignored = collect_method_names(source, module.fq_module_name)
+
+    module_ignored = DEFAULT_NO_COVER_MODULE_TOKEN in pragmas
+
+    return ModuleScan(
+        targets={
+            Target(
+                module,
+                method_name,
+                ignored=(module_ignored or method_name in ignored),
+            )
+            for method_name in found
+        },
+        aliases=collect_aliases(source, module.fq_module_name),
+    )
+
+
+def collect_module_targets(module: Module) -> set[Target]:
+    """Parse a single module and collect the targets in it."""
+
+    return scan_module(module).targets
+
+
+def scan_modules(modules: list[Module], jobs: int = 1) -> list[ModuleScan]:
+    """Scan each of the modules, in the same order."""
+
+    # parsing is CPU bound so use processes to parse modules in parallel
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(scan_module, modules, chunksize=16))
+
+    return [scan_module(module) for module in modules]
+
+
 def resolve_fq_targets(
     modules: list[Module],
+    jobs: int = 1,
 ) -> dict[str, set[Target]]:
 
-    targets = defaultdict(set)
+    targets: dict[str, set[Target]] = defaultdict(set)
+
+    for module, scan in zip(modules, scan_modules(modules, jobs=jobs), strict=True):
+        if len(scan.targets) > 0:
+            targets[module.fq_module_name] |= scan.targets
+
+    return dict(targets)
+
 
+def packages_first(module: Module) -> tuple[str, ...]:
+    """Sort key putting package `__init__` modules before their contents.
+
+    Re-exports are mostly done in the `__init__` of a package, scanning
+    them first makes the aliases known before the targets they refer to.
+
+    """
+
+    parts = module.fq_module_name.split(".")
+
+    if parts[-1] == "__init__":
+        return (*parts[:-1], "")
+
+    return tuple(parts)
+
+
+def add_pointed_aliases(
+    modules: Iterable[Module], pointer_index: "PointerIndex"
+) -> None:
+    """Add the aliases of the modules the pointers could be to aliases in.
+
+    Only the aliases are collected, which is cheap, so that the pointers
+    are with their targets before any of the targets are scanned. The
+    aliases may point into more modules, which are then looked at too.
+
+    """
+
+    # the aliases a module defines all start with its namespace
+    namespace_modules: dict[str, list[Module]] = defaultdict(list)
     for module in modules:
+        namespace_modules[module_namespace(module.fq_module_name)].append(module)
 
-        # parse the module
-        module_cst = cst.parse_module(module.path.read_text())
+    while True:
 
-        # with the tree use the collector to retrieve the method names
-        collector = MethodQualNamesCollector()
-        cst.MetadataWrapper(module_cst).visit(collector)
+        namespaces = pointer_index.alias_namespaces() & namespace_modules.keys()
+        if len(namespaces) == 0:
+            break
 
-        for method_name in collector.found:
+        for namespace in namespaces:
+            for module in namespace_modules.pop(namespace):
+                pointer_index.add_aliases(scan_aliases(module))
 
-            target = Target(
-                module, method_name, ignored=(method_name in collector.ignored)
-            )
 
-            targets[module.fq_module_name].add(target)
+def iter_fq_targets(
+    modules: Iterable[Module],
+    pointer_index: Union["PointerIndex", None] = None,
+) -> Iterator[Target]:
+    """Lazily scan the modules one at a time yielding their targets.
 
-    return dict(targets)
+    The aliases the pointers could be to are added to the pointer index
+    first, if given, so that the pointers are counted for the targets
+    they refer to whatever order the modules are in.
+
+    """
+
+    if pointer_index is not None:
+        modules = list(modules)
+        add_pointed_aliases(modules, pointer_index)
+
+    for module in modules:
+
+        scan = scan_module(module)
+
+        if pointer_index is not None:
+            pointer_index.add_aliases(scan.aliases)
+
+        yield from scan.targets
+
+
+class PointerIndex(dict[str, set[str]]):
+    """The pointers to each target, with aliases resolved to the target.
+
+    Pointers to an alias are moved to the name it resolves to as the
+    alias is added, so looking up the pointers of a target is a single
+    dictionary lookup even when aliases are found while scanning.
+
+    Only pointers given as dotted names can be to an alias, the ones to
+    imported objects are to the name they are defined at. If the
+    `dotted_names` aren't given any of the pointers can be moved.
+
+    """
+
+    def __init__(
+        self,
+        target_pointers: dict[str, Iterable[str]],
+        dotted_names: Iterable[str] | None = None,
+    ):  # nochecklist:
+
+        super().__init__(
+            (target, set(pointers)) for target, pointers in target_pointers.items()
+        )
+
+        self.aliases: dict[str, str] = {}
+
+        # followed to the names their pointers are moved to
+        self.dotted_names = set(dotted_names) if dotted_names is not None else None
+
+    def is_dotted(self, name: str) -> bool:
+        """Whether the pointers to the name may be to an alias."""
+
+        return self.dotted_names is None or name in self.dotted_names
+
+    def resolve(self, name: str) -> str:
+        """Follow the aliases to the name that is finally referred to."""
+
+        seen = {name}
+        while name in self.aliases:
+            name = self.aliases[name]
+
+            # guard against alias loops from conditional definitions
+            if name in seen:
+                break
+            seen.add(name)
+
+        return name
+
+    def alias_namespaces(self) -> set[str]:
+        """The namespaces of the modules with aliases that could move pointers."""
+
+        return {
+            name[:idx]
+            for name in self
+            if self.is_dotted(name)
+            for idx, char in enumerate(name)
+            if char == "."
+        }
+
+    def add_aliases(self, aliases: dict[str, str]) -> None:
+
+        for alias, name in aliases.items():
+
+            resolved = self.resolve(name)
+
+            if resolved == alias:
+                continue
+
+            # the pointers to a real target stay with it
+            if alias in self and not self.is_dotted(alias):
+                continue
+
+            self.aliases[alias] = name
+
+            # everything resolving to the alias resolves further now
+            alias_pointers = self.pop(alias, None)
+            if alias_pointers is not None:
+                self.setdefault(resolved, set()).update(alias_pointers)
+
+                if self.dotted_names is not None:
+                    self.dotted_names.add(resolved)
 
 
 @dataclass
@@ -131,21 +584,50 @@ class TargetResult:
     target: Target
     num_pointers: int
 
+    # seconds taken by the fastest and all of the pointing tests, when known
+    min_duration: float | None = None
+    total_duration: float = 0.0
+
 
 def collect_case_passes(
     target_pointers: dict[str, set[str]],
     targets: Iterable[Target],
 ) -> list[TargetResult]:
 
-    target_results = []
-    for target in targets:
-        test_count: int = len(target_pointers.get(target.fq_name(), {}))
+    return list(iter_case_passes(target_pointers, targets))
 
-        target_results.append(
-            TargetResult(
-                target=target,
-                num_pointers=test_count,
-            )
-        )
 
-    return target_results
+def iter_case_passes(
+    target_pointers: dict[str, set[str]],
+    targets: Iterable[Target],
+    durations: Mapping[str, float] | None = None,
+) -> Iterator[TargetResult]:
+    """Lazily count the pointers for each target.
+
+    If the `durations` of the tests are given the time taken by the
+    pointing tests is added up too.
+
+    """
+
+    for target in targets:
+        pointers = target_pointers.get(target.fq_name(), set())
+        test_count: int = len(pointers)
+
+        min_duration = None
+        total_duration = 0.0
+        if durations is not None:
+
+            test_durations = [
+                durations[nodeid] for nodeid in pointers if nodeid in durations
+            ]
+
+            if len(test_durations) > 0:
+                min_duration = min(test_durations)
+                total_duration = sum(test_durations)
+
+        yield TargetResult(
+            target=target,
+            num_pointers=test_count,
+            min_duration=min_duration,
+            total_duration=total_duration,
+        )
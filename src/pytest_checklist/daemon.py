@@ -0,0 +1,248 @@
+"""Daemon keeping a warm index of the targets for repeated pytest runs.
+
+The daemon listens on a Unix socket for newline delimited JSON
+requests and answers each with the inventory of the requested source
+directory (see `pytest_checklist.inventory`). Files are watched by
+polling their stats and only changed files are parsed again.
+
+"""
+
+import json
+import socket
+import socketserver
+import stat
+import threading
+from pathlib import Path
+from typing import Any
+
+from pytest_checklist.defaults import DEFAULT_DAEMON_POLL_INTERVAL
+from pytest_checklist.inventory import (
+    Inventory,
+    inventory_from_dict,
+    inventory_to_dict,
+    scan_source,
+)
+
+SCAN_COMMAND = "scan"
+
+
+class TargetIndex:
+    """The inventory of one source directory, kept up to date on refresh."""
+
+    def __init__(
+        self,
+        source_dir: Path,
+        exclude_patterns: list[str],
+        search_path: Path,
+    ):  # nochecklist:
+
+        self.source_dir = source_dir
+        self.exclude_patterns = exclude_patterns
+        self.search_path = search_path
+
+        self.inventory: Inventory | None = None
+
+        # the error of the last refresh, if it failed
+        self.error: Exception | None = None
+
+        self._lock = threading.Lock()
+
+    def refresh(self, jobs: int = 1) -> Inventory:
+        """Rescan the source, only parsing the files changed since last time."""
+
+        with self._lock:
+
+            try:
+                self.inventory = scan_source(
+                    self.source_dir,
+                    self.exclude_patterns,
+                    self.search_path,
+                    previous=self.inventory,
+                    jobs=jobs,
+                )
+            except Exception as err:
+                self.error = err
+                raise
+
+            self.error = None
+
+            return self.inventory
+
+    def current(self) -> Inventory:
+        """The inventory of the last refresh, refreshing if it isn't good.
+
+        It can be behind the files by up to the time between refreshes.
+
+        """
+
+        inventory = self.inventory
+
+        if inventory is None or self.error is not None:
+            return self.refresh()
+
+        return inventory
+
+
+class TargetIndexServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves scan requests from the warm indexes, one per source directory."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: Path,
+        poll_interval: float = DEFAULT_DAEMON_POLL_INTERVAL,
+    ):  # nochecklist:
+
+        self.indexes: dict[tuple[Path, tuple[str, ...], Path], TargetIndex] = {}
+        self.indexes_lock = threading.Lock()
+
+        self.socket_path = socket_path
+        self.poll_interval = poll_interval
+        self.stopped = threading.Event()
+
+        remove_stale_socket(socket_path)
+
+        super().__init__(str(socket_path), ScanRequestHandler)
+
+    def get_index(
+        self,
+        source_dir: Path,
+        exclude_patterns: list[str],
+        search_path: Path,
+    ) -> TargetIndex:
+
+        key = (source_dir, tuple(sorted(exclude_patterns)), search_path)
+
+        with self.indexes_lock:
+            if key not in self.indexes:
+                self.indexes[key] = TargetIndex(
+                    source_dir, exclude_patterns, search_path
+                )
+
+            return self.indexes[key]
+
+    def watch(self) -> None:  # nochecklist: background loop
+        """Keep refreshing the indexes until the server is stopped."""
+
+        while not self.stopped.wait(self.poll_interval):
+
+            with self.indexes_lock:
+                indexes = list(self.indexes.values())
+
+            for index in indexes:
+
+                # errors, e.g. files with syntax errors in the middle of
+                # editing, are reported on the next request instead
+                try:
+                    index.refresh()
+                except Exception:  # noqa: S112
+                    continue
+
+    def serve(self) -> None:  # nochecklist: blocks until interrupted
+
+        watcher = threading.Thread(target=self.watch, daemon=True)
+        watcher.start()
+
+        try:
+            self.serve_forever()
+        finally:
+            self.stopped.set()
+            self.server_close()
+            self.socket_path.unlink(missing_ok=True)
+
+
+def remove_stale_socket(socket_path: Path) -> None:
+    """Remove a socket file left behind by a daemon that is no longer running."""
+
+    if not socket_path.exists():
+        return
+
+    # never remove anything else that happens to be at the path
+    if not stat.S_ISSOCK(socket_path.stat().st_mode):
+        raise RuntimeError(f"{socket_path} exists and is not a socket")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(socket_path))
+        except ConnectionRefusedError:
+            socket_path.unlink()
+            return
+
+    raise RuntimeError(f"A checklist daemon is already listening on {socket_path}")
+
+
+class ScanRequestHandler(socketserver.StreamRequestHandler):
+
+    server: TargetIndexServer
+
+    def handle(self) -> None:  # nochecklist: exercised through request_scan
+
+        line = self.rfile.readline()
+
+        # e.g. checking whether the daemon is running
+        if len(line) == 0:
+            return
+
+        try:
+            request = json.loads(line)
+
+            if request.get("command") != SCAN_COMMAND:
+                raise ValueError(f"Unknown command {request.get('command')}")
+
+            index = self.server.get_index(
+                Path(request["source_dir"]),
+                list(request["exclude_patterns"]),
+                Path(request["search_path"]),
+            )
+
+            # kept fresh by the watcher
+            response: dict[str, Any] = {"inventory": inventory_to_dict(index.current())}
+
+        except Exception as err:
+            response = {"error": f"{type(err).__name__}: {err}"}
+
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+def request_scan(
+    socket_path: Path,
+    source_dir: Path,
+    exclude_patterns: list[str],
+    search_path: Path,
+    timeout: float | None = None,
+) -> Inventory | None:
+    """Ask a running daemon for the inventory of the source directory.
+
+    Returns None if no daemon is listening on the socket or it doesn't
+    answer, so that the caller can scan the source itself.
+
+    """
+
+    request = {
+        "command": SCAN_COMMAND,
+        "source_dir": str(source_dir),
+        "exclude_patterns": sorted(exclude_patterns),
+        "search_path": str(search_path),
+    }
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+
+            client.settimeout(timeout)
+            client.connect(str(socket_path))
+
+            with client.makefile("rwb") as stream:
+                stream.write(json.dumps(request).encode() + b"\n")
+                stream.flush()
+
+                response = json.loads(stream.readline())
+
+    # closed without a reply, e.g. when the daemon was stopped mid-scan
+    except (OSError, ValueError):
+        return None
+
+    if "error" in response:
+        raise RuntimeError(f"Checklist daemon failed to scan: {response['error']}")
+
+    return inventory_from_dict(response["inventory"])
@@ -2,5 +2,26 @@ DEFAULT_MIN_NUM_POINTERS = 1
 DEFAULT_PASS_THRESHOLD = 100.0
 
 DEFAULT_NO_COVER_TOKEN = "nochecklist:"  # noqa: S105
+DEFAULT_NO_COVER_MODULE_TOKEN = "nochecklist-module:"  # noqa: S105
+DEFAULT_NO_COVER_FILE_TOKEN = "nochecklist-file:"  # noqa: S105
 
 DEFAULT_COLLECT_PATH = ""
+
+DEFAULT_ROLLUP_DEPTH = 2
+DEFAULT_ROLLUP_EXPAND = 5
+
+DEFAULT_REPORT_LIMIT = 0
+DEFAULT_REPORT_CHUNK_SIZE = 1000
+
+DEFAULT_INVENTORY_PATH = "checklist-inventory.json"
+
+DEFAULT_REPORT_WORST = 0
+
+DEFAULT_DAEMON_SOCKET = ".checklist-daemon.sock"
+DEFAULT_DAEMON_POLL_INTERVAL = 1.0
+DEFAULT_DAEMON_TIMEOUT = 30.0
+
+DEFAULT_MATRIX_PATH = "checklist-matrix.json"
+
+DEFAULT_ENGINE_MAX_WORKERS = 4
+DEFAULT_ENGINE_MAX_CACHED = 32
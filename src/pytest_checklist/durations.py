@@ -0,0 +1,38 @@
+"""Timing the tests so it can be attributed to the targets they point to."""
+
+from collections import defaultdict
+
+import pytest
+
+
+class DurationRecorder:
+    """Plugin adding up the time each test takes, only kept in memory.
+
+    The setup, call and teardown phases are all included.
+
+    """
+
+    def __init__(self) -> None:  # nochecklist:
+        self.durations: dict[str, float] = defaultdict(float)
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        self.durations[report.nodeid] += report.duration
+
+
+def merge_durations(
+    previous: dict[str, float],
+    current: dict[str, float],
+    nodeids: set[str],
+) -> dict[str, float]:
+    """The durations of the tests, from this run if they ran in it.
+
+    Only the durations of the given tests are kept, e.g. the ones that
+    have pointers, so the tests that were deleted are dropped.
+
+    """
+
+    return {
+        nodeid: current.get(nodeid, previous.get(nodeid, 0.0))
+        for nodeid in nodeids
+        if nodeid in current or nodeid in previous
+    }
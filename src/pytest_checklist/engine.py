@@ -0,0 +1,390 @@
+"""Engine for scanning and reporting on source trees from within other tools.
+
+The pytest plugin scans one source tree once per session so it only
+uses the functions here, streaming the targets without caching them.
+Tools embedding checklist, e.g. a service checking many
+repositories, can use a `ChecklistEngine` from any number of threads:
+it keeps the inventories of the scanned sources so that rescans only
+parse the changed files, and runs the scans and reports on a bounded
+pool of threads. The futures it gives can be awaited from asyncio
+with `asyncio.wrap_future`.
+
+"""
+
+import itertools as it
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping, TypeVar
+
+from pytest_checklist.app import (
+    ReportAccumulator,
+    TargetReport,
+    drain,
+    iter_target_reports,
+    tap,
+)
+from pytest_checklist.collector import (
+    PointerIndex,
+    Target,
+    detect_files,
+    iter_case_passes,
+    iter_fq_targets,
+    packages_first,
+    resolve_fq_modules,
+)
+from pytest_checklist.daemon import TargetIndex
+from pytest_checklist.defaults import (
+    DEFAULT_ENGINE_MAX_CACHED,
+    DEFAULT_ENGINE_MAX_WORKERS,
+    DEFAULT_MIN_NUM_POINTERS,
+)
+from pytest_checklist.inventory import Inventory
+from pytest_checklist.rules import RuleMatcher, iter_rule_reports
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Source:
+    """A source directory to gather targets from, keying the engine cache."""
+
+    source_dir: Path
+    search_path: Path
+
+    # sorted so the same patterns always give the same key
+    exclude_patterns: tuple[str, ...] = ()
+
+
+def iter_until_cancelled(items: Iterable[T], cancel: threading.Event) -> Iterator[T]:
+    """Pass the items through, raising `CancelledError` once `cancel` is set."""
+
+    for item in items:
+
+        if cancel.is_set():
+            raise CancelledError()
+
+        yield item
+
+
+def iter_source_targets(
+    source: Source,
+    pointer_index: PointerIndex | None = None,
+) -> Iterator[Target]:
+    """Lazily parse the targets of the source one module at a time.
+
+    The aliases are added to the pointer index as they are found.
+
+    """
+
+    check_paths, _ = detect_files(source.source_dir, list(source.exclude_patterns))
+
+    check_modules = resolve_fq_modules(check_paths, source.search_path)
+
+    # the aliases the pointers need are collected before any targets
+    return iter_fq_targets(sorted(check_modules, key=packages_first), pointer_index)
+
+
+def iter_reports(
+    targets: Iterable[Target],
+    target_pointers: dict[str, set[str]],
+    target_min_pass: int = DEFAULT_MIN_NUM_POINTERS,
+    rules: RuleMatcher | None = None,
+    pointer_markers: Mapping[str, Iterable[str]] | None = None,
+    durations: Mapping[str, float] | None = None,
+    cancel: threading.Event | None = None,
+) -> Iterator[TargetReport]:
+    """Lazily decide whether each target passes, by the rules if there are any.
+
+    Stops with a `CancelledError` at the next target after `cancel` is set.
+
+    """
+
+    if cancel is not None:
+        targets = iter_until_cancelled(targets, cancel)
+
+    results = iter_case_passes(target_pointers, targets, durations)
+
+    if rules is not None and len(rules.rules) > 0:
+        return iter_rule_reports(
+            results,
+            rules,
+            target_min_pass,
+            target_pointers,
+            pointer_markers if pointer_markers is not None else {},
+        )
+
+    return iter_target_reports(results, target_min_pass)
+
+
+class ChecklistEngine:
+    """Scans and reports on source directories, safe to use from any thread.
+
+    The inventories of the `max_cached` most recently used sources are
+    kept, rescanning one of them only parses the files changed since.
+    Scans and reports run on up to `max_workers` threads, each parsing
+    with `jobs` processes. Scans of the same source wait for each other
+    while different sources are scanned in parallel.
+
+    The inventories are shared between all the callers and must not be
+    changed. The mappings passed to `report` must not be changed until
+    it is done.
+
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_ENGINE_MAX_WORKERS,
+        max_cached: int = DEFAULT_ENGINE_MAX_CACHED,
+        jobs: int = 1,
+    ):  # nochecklist:
+
+        self.max_cached = max_cached
+        self.jobs = jobs
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="checklist-engine",
+        )
+
+        # least recently used first
+        self._indexes: OrderedDict[Source, TargetIndex] = OrderedDict()
+
+        # scans in progress, shared by everyone asking for the same source
+        self._pending_scans: dict[Source, Future[Inventory]] = {}
+
+        # set to stop the work of a future that is already running
+        self._cancel_events: dict[Future, threading.Event] = {}
+
+        # reentrant as done callbacks may run right away in the same thread
+        self._lock = threading.RLock()
+
+    def index(self, source: Source) -> TargetIndex:
+        """The cached index of the source, made if needed.
+
+        When more than `max_cached` sources are kept the least recently
+        used is dropped. Scans already using it still finish.
+
+        """
+
+        with self._lock:
+
+            index = self._indexes.get(source)
+
+            if index is None:
+                index = TargetIndex(
+                    source.source_dir,
+                    list(source.exclude_patterns),
+                    source.search_path,
+                )
+                self._indexes[source] = index
+
+                while len(self._indexes) > self.max_cached:
+                    self._indexes.popitem(last=False)
+
+            else:
+                self._indexes.move_to_end(source)
+
+            return index
+
+    def cached(self, source: Source) -> Inventory | None:
+        """The inventory of the last scan of the source, if it is still cached."""
+
+        with self._lock:
+            index = self._indexes.get(source)
+
+        if index is None:
+            return None
+
+        return index.inventory
+
+    def evict(self, source: Source) -> None:
+
+        with self._lock:
+            self._indexes.pop(source, None)
+
+    def clear(self) -> None:
+
+        with self._lock:
+            self._indexes.clear()
+
+    def refresh(
+        self,
+        source: Source,
+        cancel: threading.Event | None = None,
+    ) -> Inventory:
+        """Scan the source in this thread, reusing the cached inventory."""
+
+        if cancel is not None and cancel.is_set():
+            raise CancelledError()
+
+        return self.index(source).refresh(jobs=self.jobs)
+
+    def iter_targets(
+        self,
+        source: Source,
+        pointer_index: PointerIndex | None = None,
+    ) -> Iterator[Target]:
+        """The targets of the source, adding the aliases to the pointer index.
+
+        Sources that aren't cached are parsed lazily one module at a time
+        and aren't added to the cache, so that only the targets being
+        looked at are held in memory.
+
+        """
+
+        with self._lock:
+            is_cached = source in self._indexes
+
+        if is_cached:
+
+            inventory = self.refresh(source)
+
+            if pointer_index is not None:
+                pointer_index.add_aliases(inventory.aliases())
+
+            return it.chain.from_iterable(inventory.targets().values())
+
+        return iter_source_targets(source, pointer_index)
+
+    def submit(self, func: Callable[[threading.Event], T]) -> Future[T]:
+        """Run a function on the worker threads.
+
+        It is passed an event that is set when the future is cancelled
+        while running, to stop early by raising `CancelledError`.
+
+        """
+
+        cancel = threading.Event()
+
+        future = self._executor.submit(func, cancel)
+
+        with self._lock:
+            self._cancel_events[future] = cancel
+
+        def forget_cancel_event(future: Future) -> None:
+            with self._lock:
+                self._cancel_events.pop(future, None)
+
+        future.add_done_callback(forget_cancel_event)
+
+        return future
+
+    def cancel(self, future: Future) -> bool:
+        """Cancel a future of this engine, even if it is already running.
+
+        Running reports stop at the next target, a scan that has started
+        parsing finishes and its inventory is still cached. Returns False
+        if it had already finished or is a scan that will still finish.
+
+        """
+
+        with self._lock:
+            cancel = self._cancel_events.get(future)
+            is_scan = future in self._pending_scans.values()
+
+        if cancel is not None:
+            cancel.set()
+
+        if future.cancel():
+            return True
+
+        return not is_scan and not future.done()
+
+    def scan(self, source: Source) -> Future[Inventory]:
+        """Scan the source in the background.
+
+        Asking for a source that is already being scanned gives the
+        future of that scan, so cancelling it cancels it for everyone.
+
+        """
+
+        with self._lock:
+
+            pending = self._pending_scans.get(source)
+            if pending is not None and not pending.done():
+                return pending
+
+            future = self.submit(lambda cancel: self.refresh(source, cancel))
+            self._pending_scans[source] = future
+
+        def forget_scan(future: Future) -> None:
+            with self._lock:
+                if self._pending_scans.get(source) is future:
+                    del self._pending_scans[source]
+
+        future.add_done_callback(forget_scan)
+
+        return future
+
+    def report(
+        self,
+        source: Source,
+        target_pointers: Mapping[str, Iterable[str]],
+        target_min_pass: int = DEFAULT_MIN_NUM_POINTERS,
+        rules: RuleMatcher | None = None,
+        pointer_markers: Mapping[str, Iterable[str]] | None = None,
+        durations: Mapping[str, float] | None = None,
+        num_worst: int = 0,
+        track_modules: bool = False,
+        sinks: list[Callable[[TargetReport], None]] | None = None,
+    ) -> Future[ReportAccumulator]:
+        """Scan the source and summarize its reports in the background.
+
+        Each report is also passed to the `sinks`, on a worker thread.
+
+        """
+
+        def run(cancel: threading.Event) -> ReportAccumulator:
+
+            # scanned in this worker instead of waiting on another one,
+            # which could deadlock when all the workers are reporting
+            inventory = self.refresh(source, cancel)
+
+            pointer_index = PointerIndex(dict(target_pointers))
+            pointer_index.add_aliases(inventory.aliases())
+
+            accumulator = ReportAccumulator(
+                num_worst=num_worst,
+                track_modules=track_modules,
+            )
+
+            drain(
+                tap(
+                    iter_reports(
+                        it.chain.from_iterable(inventory.targets().values()),
+                        pointer_index,
+                        target_min_pass,
+                        rules=rules,
+                        pointer_markers=pointer_markers,
+                        durations=durations,
+                        cancel=cancel,
+                    ),
+                    [accumulator.add, *(sinks or [])],
+                )
+            )
+
+            return accumulator
+
+        return self.submit(run)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """Stop the worker threads, optionally cancelling all the futures."""
+
+        if cancel_futures:
+
+            with self._lock:
+                cancel_events = list(self._cancel_events.values())
+
+            for cancel in cancel_events:
+                cancel.set()
+
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def __enter__(self) -> "ChecklistEngine":  # nochecklist:
+        return self
+
+    def __exit__(self, *exc_info) -> None:  # nochecklist:
+        self.shutdown()
@@ -0,0 +1,303 @@
+"""Local store of the checklist results of previous runs."""
+
+import sqlite3
+import subprocess  # noqa: S404
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+from pytest_checklist.app import CoverageCounts, TargetReport
+
+HISTORY_FNAME = "history.sqlite3"
+
+# the number of pointers, whether it passes and whether it is ignored
+Status = tuple[int | None, int | None, int | None]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    commit_id TEXT,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_commit_id ON runs (commit_id);
+CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (timestamp);
+
+CREATE TABLE IF NOT EXISTS module_counts (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    module TEXT NOT NULL,
+    num_targets INTEGER NOT NULL,
+    num_passes INTEGER NOT NULL,
+    num_ignored INTEGER NOT NULL,
+    PRIMARY KEY (run_id, module)
+) WITHOUT ROWID;
+
+-- every target ever recorded, with its status in the last run it was
+-- in, so that only the changes have to be written for each run
+CREATE TABLE IF NOT EXISTS targets (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    num_pointers INTEGER,
+    passes INTEGER,
+    ignored INTEGER
+);
+
+-- the status of a target from the run it changed in, all NULL for
+-- runs it wasn't in
+CREATE TABLE IF NOT EXISTS target_changes (
+    target_id INTEGER NOT NULL REFERENCES targets (id),
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    num_pointers INTEGER,
+    passes INTEGER,
+    ignored INTEGER,
+    PRIMARY KEY (target_id, run_id)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class Run:
+
+    id: int
+    commit_id: str | None
+    timestamp: float
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """Open the history database, creating the tables if needed."""
+
+    connection = sqlite3.connect(db_path)
+
+    # the history is a convenience, trade durability for fast appends
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+
+    return connection
+
+
+def resolve_commit(repo_dir: Path) -> str | None:
+    """Get the commit checked out in the repo, if there is one."""
+
+    try:
+        result = subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "HEAD"],  # noqa: S607
+            cwd=repo_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return result.stdout.strip() or None
+
+
+class HistoryRecorder:
+    """Appends a run to the history as the target reports come in.
+
+    Only the targets whose status changed since the last run are
+    written, with integer ids instead of their names. Nothing is
+    written until `finish`, which commits the whole run in a single
+    transaction.
+
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        commit_id: str | None = None,
+        timestamp: float | None = None,
+    ):  # nochecklist:
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        self.commit_id = commit_id
+        self.timestamp = timestamp
+
+        self.connection = connect(db_path)
+
+        # the rows of the targets of the last runs not reported yet in
+        # this one, kept as they come as this is most of the time taken
+        self._previous: dict[
+            str, tuple[str, int, int | None, int | None, int | None]
+        ] = {
+            row[0]: row
+            for row in self.connection.execute(
+                "SELECT name, id, num_pointers, passes, ignored FROM targets"
+            )
+        }
+
+        self._new: list[tuple[str, Status]] = []
+        self._changed: list[tuple[int, Status]] = []
+
+    def add(self, report: TargetReport) -> None:
+
+        name = report.result.target.fq_name()
+        status: Status = (
+            report.result.num_pointers,
+            int(report.passes),
+            int(report.result.target.ignored),
+        )
+
+        previous = self._previous.pop(name, None)
+
+        if previous is None:
+            self._new.append((name, status))
+
+        elif previous[2:] != status:
+            self._changed.append((previous[1], status))
+
+    def finish(self, module_counts: dict[str, CoverageCounts]) -> int:
+        """Write the run and its changes, returns the id of the new run."""
+
+        # the targets not in this run
+        self._changed.extend(
+            (row[1], (None, None, None))
+            for row in self._previous.values()
+            if row[2:] != (None, None, None)
+        )
+
+        with closing(self.connection), self.connection:
+
+            cursor = self.connection.execute(
+                "INSERT INTO runs (commit_id, timestamp) VALUES (?, ?)",
+                (self.commit_id, self.timestamp),
+            )
+
+            if cursor.lastrowid is None:
+                raise RuntimeError("Run was not recorded in the history")
+
+            run_id = cursor.lastrowid
+
+            (last_id,) = self.connection.execute(
+                "SELECT coalesce(max(id), 0) FROM targets"
+            ).fetchone()
+
+            self.connection.executemany(
+                "INSERT INTO targets (name, num_pointers, passes, ignored) "
+                "VALUES (?, ?, ?, ?)",
+                ((name, *status) for name, status in self._new),
+            )
+
+            self.connection.executemany(
+                "UPDATE targets SET num_pointers = ?, passes = ?, ignored = ? "
+                "WHERE id = ?",
+                ((*status, target_id) for target_id, status in self._changed),
+            )
+
+            self.connection.execute(
+                "INSERT INTO target_changes "
+                "SELECT id, ?, num_pointers, passes, ignored FROM targets "
+                "WHERE id > ?",
+                (run_id, last_id),
+            )
+
+            self.connection.executemany(
+                "INSERT INTO target_changes VALUES (?, ?, ?, ?, ?)",
+                ((target_id, run_id, *status) for target_id, status in self._changed),
+            )
+
+            self.connection.executemany(
+                "INSERT INTO module_counts VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id,
+                        module,
+                        counts.num_targets,
+                        counts.num_passes,
+                        counts.num_ignored,
+                    )
+                    for module, counts in module_counts.items()
+                ),
+            )
+
+        return run_id
+
+
+def list_runs(db_path: Path, commit_id: str | None = None) -> list[Run]:
+    """All the recorded runs in order, optionally only for one commit."""
+
+    query = "SELECT id, commit_id, timestamp FROM runs"
+    params: tuple[str, ...] = ()
+
+    if commit_id is not None:
+        query += " WHERE commit_id = ?"
+        params = (commit_id,)
+
+    with closing(connect(db_path)) as connection:
+        rows = connection.execute(query + " ORDER BY timestamp, id", params)
+
+        return [Run(*row) for row in rows]
+
+
+def lost_coverage_since(
+    db_path: Path,
+    since_run_id: int,
+    run_id: int | None = None,
+) -> list[str]:
+    """Targets passing in one run which are failing in a later run.
+
+    If no later run is given the most recent one is used.
+
+    """
+
+    with closing(connect(db_path)) as connection:
+
+        if run_id is None:
+            (run_id,) = connection.execute("SELECT max(id) FROM runs").fetchone()
+
+        rows = connection.execute(
+            """
+            WITH
+                -- a bare column with max() comes from the row of the max
+                old AS (
+                    SELECT target_id, passes, max(run_id)
+                    FROM target_changes
+                    WHERE run_id <= :since_run_id
+                    GROUP BY target_id
+                ),
+                new AS (
+                    SELECT target_id, passes, max(run_id)
+                    FROM target_changes
+                    WHERE run_id <= :run_id
+                    GROUP BY target_id
+                )
+            SELECT targets.name
+            FROM old
+            JOIN new USING (target_id)
+            JOIN targets ON targets.id = old.target_id
+            WHERE old.passes AND NOT new.passes
+            ORDER BY targets.name
+            """,
+            {"since_run_id": since_run_id, "run_id": run_id},
+        )
+
+        return [target for (target,) in rows]
+
+
+def package_trend(db_path: Path, package: str) -> list[tuple[Run, CoverageCounts]]:
+    """The coverage of a package (or module) for every recorded run."""
+
+    with closing(connect(db_path)) as connection:
+
+        # range on the module name instead of LIKE so the primary key
+        # index can be used, '/' is the character following '.'
+        rows = connection.execute(
+            """
+            SELECT runs.id, runs.commit_id, runs.timestamp,
+                sum(num_targets), sum(num_passes), sum(num_ignored)
+            FROM runs
+            JOIN module_counts ON module_counts.run_id = runs.id
+            WHERE module = ? OR (module >= ? AND module < ?)
+            GROUP BY runs.id
+            ORDER BY runs.timestamp, runs.id
+            """,
+            (package, f"{package}.", f"{package}/"),
+        )
+
+        return [
+            (Run(run_id, commit_id, timestamp), CoverageCounts(*counts))
+            for run_id, commit_id, timestamp, *counts in rows
+        ]
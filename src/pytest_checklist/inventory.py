@@ -0,0 +1,199 @@
+"""Inventory of the targets in a source tree which can be saved and shared."""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from pytest_checklist.collector import (
+    Module,
+    Target,
+    detect_files,
+    resolve_fq_modules,
+    scan_modules,
+)
+
+INVENTORY_VERSION = 1
+
+
+@dataclass
+class ModuleInventory:
+
+    module: Module
+
+    # stats of the file when it was scanned, to detect changes
+    mtime_ns: int
+    size: int
+
+    targets: set[Target] = field(default_factory=set)
+    aliases: dict[str, str] = field(default_factory=dict)
+
+    def is_current(self) -> bool:
+        """Whether the module file is unchanged since it was scanned."""
+
+        try:
+            stat = self.module.path.stat()
+        except OSError:
+            return False
+
+        return stat.st_mtime_ns == self.mtime_ns and stat.st_size == self.size
+
+
+@dataclass
+class Inventory:
+
+    search_path: Path
+    modules: list[ModuleInventory] = field(default_factory=list)
+
+    def targets(self) -> dict[str, set[Target]]:
+        """The targets per fully-qualified module, like `resolve_fq_targets`."""
+
+        targets: dict[str, set[Target]] = {}
+        for module_inv in self.modules:
+            if len(module_inv.targets) > 0:
+                targets.setdefault(module_inv.module.fq_module_name, set()).update(
+                    module_inv.targets
+                )
+
+        return targets
+
+    def aliases(self) -> dict[str, str]:
+        """The aliases found in all of the modules."""
+
+        aliases: dict[str, str] = {}
+        for module_inv in self.modules:
+            aliases.update(module_inv.aliases)
+
+        return aliases
+
+
+def scan_inventory(
+    modules: list[Module],
+    search_path: Path,
+    previous: Inventory | None = None,
+    jobs: int = 1,
+) -> Inventory:
+    """Scan the modules for targets.
+
+    Modules which haven't changed since the `previous` inventory was
+    made reuse the targets from it instead of being parsed again.
+
+    """
+
+    cached: dict[Module, ModuleInventory] = {}
+    if previous is not None:
+        cached = {
+            module_inv.module: module_inv
+            for module_inv in previous.modules
+            if module_inv.is_current()
+        }
+
+    to_scan = [module for module in modules if module not in cached]
+    scanned = dict(zip(to_scan, scan_modules(to_scan, jobs=jobs), strict=True))
+
+    module_invs = []
+    for module in modules:
+
+        if module in cached:
+            module_invs.append(cached[module])
+
+        else:
+            stat = module.path.stat()
+            module_invs.append(
+                ModuleInventory(
+                    module,
+                    mtime_ns=stat.st_mtime_ns,
+                    size=stat.st_size,
+                    targets=scanned[module].targets,
+                    aliases=scanned[module].aliases,
+                )
+            )
+
+    return Inventory(search_path, module_invs)
+
+
+def scan_source(
+    source_dir: Path,
+    exclude_patterns: list[str],
+    search_path: Path,
+    previous: Inventory | None = None,
+    jobs: int = 1,
+) -> Inventory:
+    """Detect, resolve and scan all the targets under the source directory."""
+
+    check_paths, _ = detect_files(source_dir, exclude_patterns)
+
+    check_modules = resolve_fq_modules(check_paths, search_path)
+
+    return scan_inventory(check_modules, search_path, previous=previous, jobs=jobs)
+
+
+def inventory_to_dict(inventory: Inventory) -> dict[str, Any]:
+
+    return {
+        "version": INVENTORY_VERSION,
+        "search_path": str(inventory.search_path),
+        "modules": [
+            {
+                "path": str(module_inv.module.path.relative_to(inventory.search_path)),
+                "fq_module_name": module_inv.module.fq_module_name,
+                "mtime_ns": module_inv.mtime_ns,
+                "size": module_inv.size,
+                "targets": sorted(
+                    [target.name, target.ignored] for target in module_inv.targets
+                ),
+                "aliases": module_inv.aliases,
+            }
+            for module_inv in inventory.modules
+        ],
+    }
+
+
+def inventory_from_dict(data: dict[str, Any]) -> Inventory:
+
+    if data.get("version") != INVENTORY_VERSION:
+        raise ValueError(
+            f"Unsupported inventory version {data.get('version')}, "
+            f"expected {INVENTORY_VERSION}"
+        )
+
+    search_path = Path(data["search_path"])
+
+    module_invs = []
+    for module_data in data["modules"]:
+
+        module = Module(
+            search_path / module_data["path"], module_data["fq_module_name"]
+        )
+
+        module_invs.append(
+            ModuleInventory(
+                module,
+                mtime_ns=module_data["mtime_ns"],
+                size=module_data["size"],
+                targets={
+                    Target(module, name, ignored=ignored)
+                    for name, ignored in module_data["targets"]
+                },
+                aliases=module_data["aliases"],
+            )
+        )
+
+    return Inventory(search_path, module_invs)
+
+
+def write_inventory(path: Path, inventory: Inventory) -> None:
+
+    with open(path, "w") as inventory_file:
+        json.dump(inventory_to_dict(inventory), inventory_file)
+
+
+def load_inventory(path: Path) -> Inventory:
+
+    with open(path) as inventory_file:
+        data = json.load(inventory_file)
+
+    try:
+        return inventory_from_dict(data)
+    except ValueError as err:
+        raise ValueError(f"Invalid inventory {path}: {err}") from err
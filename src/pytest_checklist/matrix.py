@@ -0,0 +1,189 @@
+"""Sparse matrix of which tests point to which targets."""
+
+import heapq
+import json
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+MATRIX_VERSION = 1
+
+
+@dataclass
+class CoverageMatrix:
+    """Targets by tests in compressed sparse row (CSR) form.
+
+    The tests pointing to the target `targets[row]` are the ones at the
+    positions `indices[indptr[row]:indptr[row + 1]]` of `tests`.
+
+    """
+
+    targets: list[str] = field(default_factory=list)
+    tests: list[str] = field(default_factory=list)
+
+    indptr: array = field(default_factory=lambda: array("q", [0]))
+    indices: array = field(default_factory=lambda: array("q"))
+
+    def __post_init__(self) -> None:  # nochecklist:
+
+        self._target_rows = {name: row for row, name in enumerate(self.targets)}
+        self._test_columns = {name: col for col, name in enumerate(self.tests)}
+
+        # the columns as rows, only built when needed
+        self._transposed: tuple[array, array] | None = None
+
+    def add(self, target: str, tests: Iterable[str]) -> None:
+        """Add the row of a target with the tests pointing to it."""
+
+        for test in tests:
+
+            col = self._test_columns.get(test)
+            if col is None:
+                col = len(self.tests)
+                self.tests.append(test)
+                self._test_columns[test] = col
+
+            self.indices.append(col)
+
+        self._target_rows[target] = len(self.targets)
+        self.targets.append(target)
+        self.indptr.append(len(self.indices))
+
+        self._transposed = None
+
+    def transpose(self) -> tuple[array, array]:
+        """The index pointers and indices of the matrix with tests as rows."""
+
+        if self._transposed is not None:
+            return self._transposed
+
+        # counting sort of the entries by their column
+        counts = array("q", bytes(8 * (len(self.tests) + 1)))
+        for col in self.indices:
+            counts[col + 1] += 1
+
+        for col in range(len(self.tests)):
+            counts[col + 1] += counts[col]
+
+        indptr = array("q", counts)
+        indices = array("q", bytes(8 * len(self.indices)))
+
+        for row in range(len(self.targets)):
+            for col in self.indices[self.indptr[row] : self.indptr[row + 1]]:
+                indices[counts[col]] = row
+                counts[col] += 1
+
+        self._transposed = (indptr, indices)
+
+        return self._transposed
+
+    def tests_for_target(self, target: str) -> list[str]:
+
+        row = self._target_rows.get(target)
+        if row is None:
+            return []
+
+        return [
+            self.tests[col]
+            for col in self.indices[self.indptr[row] : self.indptr[row + 1]]
+        ]
+
+    def targets_for_test(self, test: str) -> list[str]:
+
+        col = self._test_columns.get(test)
+        if col is None:
+            return []
+
+        indptr, indices = self.transpose()
+
+        return [self.targets[row] for row in indices[indptr[col] : indptr[col + 1]]]
+
+
+def minimal_test_set(matrix: CoverageMatrix) -> list[str]:
+    """A small set of tests which together point to every target.
+
+    Greedily picks the test pointing to the most targets not covered
+    yet. The number of new targets of a test only ever goes down, so
+    tests are kept in a heap by their last known count and only
+    recounted when they come out on top, instead of recounting every
+    test after each pick.
+
+    """
+
+    indptr, indices = matrix.transpose()
+
+    covered = bytearray(len(matrix.targets))
+
+    heap = [
+        (-(indptr[col + 1] - indptr[col]), col)
+        for col in range(len(matrix.tests))
+        if indptr[col + 1] > indptr[col]
+    ]
+    heapq.heapify(heap)
+
+    chosen = []
+    while len(heap) > 0:
+
+        _, col = heapq.heappop(heap)
+
+        rows = indices[indptr[col] : indptr[col + 1]]
+        num_new = sum(1 for row in rows if not covered[row])
+
+        if num_new == 0:
+            continue
+
+        # another test might cover more now, try again later
+        if len(heap) > 0 and num_new < -heap[0][0]:
+            heapq.heappush(heap, (-num_new, col))
+            continue
+
+        chosen.append(matrix.tests[col])
+        for row in rows:
+            covered[row] = True
+
+    return chosen
+
+
+def matrix_to_dict(matrix: CoverageMatrix) -> dict[str, Any]:
+
+    return {
+        "version": MATRIX_VERSION,
+        "targets": matrix.targets,
+        "tests": matrix.tests,
+        "indptr": matrix.indptr.tolist(),
+        "indices": matrix.indices.tolist(),
+    }
+
+
+def matrix_from_dict(data: dict[str, Any]) -> CoverageMatrix:
+
+    if data.get("version") != MATRIX_VERSION:
+        raise ValueError(
+            f"Unsupported matrix version {data.get('version')}, "
+            f"expected {MATRIX_VERSION}"
+        )
+
+    return CoverageMatrix(
+        targets=data["targets"],
+        tests=data["tests"],
+        indptr=array("q", data["indptr"]),
+        indices=array("q", data["indices"]),
+    )
+
+
+def write_matrix(path: Path, matrix: CoverageMatrix) -> None:
+
+    with open(path, "w") as matrix_file:
+        json.dump(matrix_to_dict(matrix), matrix_file)
+
+
+def load_matrix(path: Path) -> CoverageMatrix:
+
+    with open(path) as matrix_file:
+        data = json.load(matrix_file)
+
+    try:
+        return matrix_from_dict(data)
+    except ValueError as err:
+        raise ValueError(f"Invalid matrix {path}: {err}") from err
@@ -0,0 +1,91 @@
+"""Finding the functions in source code with libcst.
+
+This is kept apart from the collector as importing libcst is slow, so
+runs getting the targets from an inventory or daemon don't pay for it.
+
+"""
+
+import libcst as cst
+from libcst.metadata import (
+    QualifiedNameProvider,
+    ParentNodeProvider,
+)
+
+from pytest_checklist.defaults import DEFAULT_NO_COVER_TOKEN
+
+
+class MethodQualNamesCollector(cst.CSTVisitor):
+    """Collector using the CST library visitor pattern."""
+
+    METADATA_DEPENDENCIES = (QualifiedNameProvider, ParentNodeProvider)
+
+    def __init__(self, fq_module_name: str = ""):  # nochecklist:
+        self.found: set[str] = set()
+        self.ignored: set[str] = set()
+
+        self.fq_module_name = fq_module_name
+
+        # whether each of the enclosing classes is ignored
+        self._class_ignores: list[bool] = []
+
+        super().__init__()
+
+    def visit_ClassDef(self, node: cst.ClassDef) -> None:  # nochecklist:
+        self._class_ignores.append(has_ignore_comment(node))
+
+    def leave_ClassDef(self, original_node: cst.ClassDef) -> None:  # nochecklist:
+        self._class_ignores.pop()
+
+    def visit_FunctionDef(self, node: cst.FunctionDef):  # nochecklist: TODO
+
+        ignored = any(self._class_ignores) or has_ignore_comment(node)
+
+        # TODO: Find better way to remove locals
+        qual_names = self.get_metadata(QualifiedNameProvider, node)
+        for qn in qual_names:
+            from_local = qn.name.find("<locals>") > -1
+            if not from_local:
+
+                self.found.add(qn.name)
+                if ignored:
+                    self.ignored.add(qn.name)
+
+
+def has_comment(node: cst.CSTNode, token: str) -> bool:
+    """Whether any comment in the node contains the token."""
+
+    if isinstance(node, cst.Comment):
+        return node.value.find(token) > -1
+
+    return any(has_comment(child, token) for child in node.children)
+
+
+def has_ignore_comment(node: cst.FunctionDef | cst.ClassDef) -> bool:
+    """Whether a definition is ignored with a comment.
+
+    The comment can be on the lines just above it, its decorators, any
+    line of its signature or after the colon, but not in its body.
+
+    """
+
+    parts: list[cst.CSTNode] = [
+        child for child in node.children if child is not node.body
+    ]
+
+    # only the comment on the line of the colon from the body
+    if isinstance(node.body, cst.IndentedBlock):
+        parts.append(node.body.header)
+    elif isinstance(node.body, cst.SimpleStatementSuite):
+        parts.append(node.body.trailing_whitespace)
+
+    return any(has_comment(part, DEFAULT_NO_COVER_TOKEN) for part in parts)
+
+
+def collect_method_names(source: str, fq_module_name: str) -> tuple[set[str], set[str]]:
+    """The qualified names of the functions in the source and the ignored ones."""
+
+    # with the tree use the collector to retrieve the method names
+    collector = MethodQualNamesCollector(fq_module_name)
+    cst.MetadataWrapper(cst.parse_module(source)).visit(collector)
+
+    return collector.found, collector.ignored
@@ -1,3 +1,4 @@
+import sys
 from pathlib import Path
 
 INIT_FNAME = "__init__.py"
@@ -39,3 +40,39 @@ def find_top_level_module_dir(dirpath: Path) -> Path | None:
                 return parent
 
     return None
+
+
+def resolve_module_search_path(source_dir: Path, infer_search_module: bool) -> Path:
+    """Get the directory the fully-qualified module names are relative to.
+
+    If `infer_search_module` is set this is the first directory in an
+    upward search without an `__init__.py` file. Otherwise the legacy
+    behavior is used and the first path from `sys.path` that contains
+    `source_dir` is used.
+
+    """
+
+    if infer_search_module:
+
+        maybe_module_path = find_top_level_module_dir(source_dir)
+
+        if maybe_module_path is None:
+            raise ValueError(
+                f"No module search path resolved from --checklist-collect directory {source_dir}"
+            )
+
+        return maybe_module_path
+
+    # the legacy behavior
+    else:
+        # grab the first matching path from sys.path
+        sys_paths = [Path(p) for p in sys.path]
+        matches = ({source_dir} | set(source_dir.parents)) & set(sys_paths)
+
+        if len(matches) == 0:
+            raise ValueError(
+                f"No module search path for {source_dir} in sys.path, "
+                "infer it from the package directories instead"
+            )
+
+        return min(matches)
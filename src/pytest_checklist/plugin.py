@@ -1,29 +1,77 @@
+import time
 import warnings
 from pathlib import Path
-import sys
+from typing import Callable, Iterable
 import itertools as it
 
 import pytest
+from _pytest.skipping import evaluate_skip_marks
 from rich.console import Console
+from rich.text import Text
 
-from pytest_checklist.pointer import resolve_pointer_mark_target
-from pytest_checklist.app import is_passing, resolve_exclude_patterns, TargetReport
+from pytest_checklist.pointer import (
+    find_unresolved_pointers,
+    resolve_pointer_mark_target,
+)
+from pytest_checklist.app import (
+    drain,
+    resolve_exclude_patterns,
+    tap,
+    ReportAccumulator,
+    TargetReport,
+)
 from pytest_checklist.defaults import (
     DEFAULT_MIN_NUM_POINTERS,
     DEFAULT_PASS_THRESHOLD,
     DEFAULT_COLLECT_PATH,
+    DEFAULT_DAEMON_TIMEOUT,
+    DEFAULT_REPORT_LIMIT,
+    DEFAULT_REPORT_WORST,
+    DEFAULT_ROLLUP_DEPTH,
+    DEFAULT_ROLLUP_EXPAND,
 )
-from pytest_checklist.collector import (
-    collect_case_passes,
-    detect_files,
-    resolve_fq_modules,
-    resolve_fq_targets,
+from pytest_checklist.collector import PointerIndex, Target
+from pytest_checklist.baseline import (
+    compare_baseline,
+    read_baseline,
+    write_baseline,
 )
-from pytest_checklist.report import make_report
-from pytest_checklist.path_utils import find_top_level_module_dir
+from pytest_checklist.daemon import request_scan
+from pytest_checklist.durations import DurationRecorder, merge_durations
+from pytest_checklist.engine import Source, iter_reports, iter_source_targets
+from pytest_checklist.inventory import load_inventory
+from pytest_checklist.matrix import CoverageMatrix, write_matrix
+from pytest_checklist.history import HISTORY_FNAME, HistoryRecorder, resolve_commit
+from pytest_checklist.report import (
+    iter_report_lines,
+    make_duration_report,
+    make_rollup_report,
+    paginate,
+    write_report,
+)
+from pytest_checklist.path_utils import resolve_module_search_path
+from pytest_checklist.reconcile import nodeid_path, reconcile_pointers
+from pytest_checklist.rules import RuleMatcher, parse_rule
 
 CACHE_TARGETS = "checklist/targets"
 CACHE_ALL_FUNC = "checklist/funcs"
+CACHE_LAST_SEEN = "checklist/last_seen"
+CACHE_FRESHNESS = "checklist/freshness"
+CACHE_POINTER_MARKERS = "checklist/pointer_markers"
+CACHE_DURATIONS = "checklist/durations"
+CACHE_DIR = "checklist"
+
+# tests deselected, e.g. with `-k`, which still have pointers
+DESELECTED_ITEMS = pytest.StashKey[list[pytest.Item]]()
+
+# the pass rules from the ini file
+PASS_RULES = pytest.StashKey[RuleMatcher]()
+
+# times of the tests in this run
+DURATIONS = pytest.StashKey[DurationRecorder]()
+
+# pointer marks which couldn't be resolved, by the nodeid of their test
+POINTER_ERRORS = pytest.StashKey[dict[str, ValueError]]()
 
 
 def pytest_addoption(parser) -> None:  # nochecklist:
@@ -79,6 +127,34 @@ def pytest_addoption(parser) -> None:  # nochecklist:
         ),
     )
 
+    group.addoption(
+        "--checklist-inventory",
+        dest="checklist_inventory",
+        default="",
+        help=(
+            "Inventory file written by `pytest-checklist scan` to load the targets from instead of scanning the source code. "
+            "If the file doesn't exist the source code is scanned as usual."
+        ),
+    )
+
+    group.addoption(
+        "--checklist-daemon-socket",
+        dest="checklist_daemon_socket",
+        default="",
+        help=(
+            "Socket of a daemon started with `pytest-checklist serve` to get the targets from. "
+            "If no daemon is listening the source code is scanned as usual."
+        ),
+    )
+    group.addoption(
+        "--checklist-daemon-timeout",
+        action="store",
+        dest="checklist_daemon_timeout",
+        default=DEFAULT_DAEMON_TIMEOUT,
+        type=float,
+        help=f"Seconds to wait for the daemon before scanning the source code instead.\nDefault: {DEFAULT_DAEMON_TIMEOUT}",
+    )
+
     group.addoption(
         "--checklist-exclude",
         dest="checklist_exclude",
@@ -99,30 +175,170 @@ def pytest_addoption(parser) -> None:  # nochecklist:
         default=False,
         help="Show passing units in checklist report.",
     )
+    group.addoption(
+        "--checklist-report-limit",
+        action="store",
+        dest="checklist_report_limit",
+        default=DEFAULT_REPORT_LIMIT,
+        type=int,
+        help=f"Maximum number of target lines shown per page of the checklist report, 0 for no limit.\nDefault: {DEFAULT_REPORT_LIMIT}",
+    )
+    group.addoption(
+        "--checklist-report-page",
+        action="store",
+        dest="checklist_report_page",
+        default=1,
+        type=int,
+        help="Page of the checklist report to show when `--checklist-report-limit` is given.\nDefault: 1",
+    )
+    group.addoption(
+        "--checklist-report-durations",
+        action="store_true",
+        dest="checklist_report_durations",
+        default=False,
+        help=(
+            "Time the tests and show the time of the fastest test pointing to each target in the report, "
+            "and the total time of the tests pointing to each module."
+        ),
+    )
+    group.addoption(
+        "--checklist-report-worst",
+        action="store",
+        dest="checklist_report_worst",
+        default=DEFAULT_REPORT_WORST,
+        type=int,
+        help=f"Show this many failing targets with the fewest pointers in the summary, even without `--checklist-report`.\nDefault: {DEFAULT_REPORT_WORST}",
+    )
+    group.addoption(
+        "--checklist-report-rollup",
+        action="store_true",
+        dest="checklist_report_rollup",
+        default=False,
+        help="Show a tree of the coverage rolled up by package and module in the console.",
+    )
+    group.addoption(
+        "--checklist-rollup-depth",
+        action="store",
+        dest="checklist_rollup_depth",
+        default=DEFAULT_ROLLUP_DEPTH,
+        type=int,
+        help=f"Number of package levels always shown in the rollup report.\nDefault: {DEFAULT_ROLLUP_DEPTH}",
+    )
+    group.addoption(
+        "--checklist-rollup-expand",
+        action="store",
+        dest="checklist_rollup_expand",
+        default=DEFAULT_ROLLUP_EXPAND,
+        type=int,
+        help=f"Number of worst covered modules to expand below the depth limit in the rollup report.\nDefault: {DEFAULT_ROLLUP_EXPAND}",
+    )
+    group.addoption(
+        "--checklist-history",
+        action="store_true",
+        dest="checklist_history",
+        default=False,
+        help="Record the results of the run to the history database in the pytest cache directory.",
+    )
+    group.addoption(
+        "--checklist-history-commit",
+        dest="checklist_history_commit",
+        default="",
+        help="Commit to record the run under in the history. If not given it is taken from git, if available.",
+    )
+    group.addoption(
+        "--checklist-matrix",
+        dest="checklist_matrix",
+        default="",
+        help=(
+            "File to write the matrix of which tests point to which targets to, "
+            "for querying with `pytest-checklist matrix`."
+        ),
+    )
+    group.addoption(
+        "--checklist-baseline",
+        dest="checklist_baseline",
+        default="",
+        help=(
+            "File with the target statuses of a previous run. If given only regressions against it will fail: "
+            "previously passing targets that aren't anymore and new targets that aren't passing. "
+            "Replaces the check of `--checklist-fail-under`."
+        ),
+    )
+    group.addoption(
+        "--checklist-update-baseline",
+        action="store_true",
+        dest="checklist_update_baseline",
+        default=False,
+        help="Overwrite the `--checklist-baseline` file with the statuses of this run instead of comparing to it.",
+    )
+
+    parser.addini(
+        "checklist_rules",
+        type="linelist",
+        default=[],
+        help=(
+            "Pass rules for targets matching a glob, one per line as "
+            "'<pattern> <min pointers> [marker=<name>]'. The first matching rule applies, "
+            "targets not matching any need `--checklist-target-min-pass` pointers."
+        ),
+    )
 
 
 def pytest_configure(config) -> None:  # nochecklist:
     config.addinivalue_line("markers", "pointer(element): Define a tested element.")
 
+    try:
+        config.stash[PASS_RULES] = RuleMatcher(
+            parse_rule(line) for line in config.getini("checklist_rules")
+        )
+    except ValueError as err:
+        raise pytest.UsageError(str(err)) from err
+
+    if (
+        config.option.checklist_update_baseline
+        and config.option.checklist_baseline == ""
+    ):
+        raise pytest.UsageError(
+            "--checklist-update-baseline needs the file to write in --checklist-baseline"
+        )
+
+    # only listens to the test reports when asked for
+    if config.option.checklist_report_durations and not is_disabled(config):
+        config.stash[DURATIONS] = DurationRecorder()
+        config.pluginmanager.register(config.stash[DURATIONS], "checklist-durations")
+
 
 def is_disabled(config) -> bool:
 
     if config.option.checklist_disabled:
         return True
 
-    elif config.option.checklist_collect == "" and not config.option.checklist_report:
+    elif (
+        config.option.checklist_collect == ""
+        and not config.option.checklist_report
+        and not config.option.checklist_report_rollup
+    ):
         return True
     else:
         return False
 
 
+def is_xdist_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def is_xdist_controller(config) -> bool:
+    return (
+        not is_xdist_worker(config)
+        and getattr(config.option, "dist", "no") != "no"
+        and bool(getattr(config.option, "numprocesses", None))
+    )
+
+
 def pytest_sessionstart(session: pytest.Session) -> None:  # nochecklist:
 
     if not is_disabled(session.config):
 
-        if session.config.cache is not None:
-            session.config.cache.set(CACHE_TARGETS, {})
-
         # Emit a deprecation warning for the infer-search-module
         if not session.config.option.checklist_infer_search_module:
 
@@ -133,55 +349,271 @@ def pytest_sessionstart(session: pytest.Session) -> None:  # nochecklist:
             )
 
 
-@pytest.fixture(scope="function", autouse=True)
-def _pointer_marker(request) -> None:  # nochecklist:
-    """Fixture that is autoinjected to each test case.
+def pytest_deselected(items: list[pytest.Item]) -> None:  # nochecklist:
 
-    It will detect if there is a pointer marker and register this test
-    case to the target.
+    # deselected tests still exist so their pointers count, the config
+    # isn't passed to this hook so it is taken from the items
+    for item in items:
+        item.config.stash.setdefault(DESELECTED_ITEMS, []).append(item)
+
+
+def is_skipped(item: pytest.Item) -> bool:
+    """Whether the test is skipped by a `skip` or true `skipif` mark."""
+
+    try:
+        return evaluate_skip_marks(item) is not None
+
+    # invalid conditions are reported when the test runs
+    except pytest.fail.Exception:
+        return False
+
+
+def collect_item_pointers(
+    items: Iterable[pytest.Item],
+) -> tuple[dict[str, set[str]], set[str], dict[str, ValueError]]:
+    """The pointers of the tests, the dotted name pointers and invalid marks.
+
+    Tests that are skipped by their marks never run so they don't count.
 
     """
 
-    if is_disabled(request.config):
-        return None
+    target_pointers: dict[str, set[str]] = {}
+    string_pointers: set[str] = set()
+    errors: dict[str, ValueError] = {}
 
-    # load the cached pointers, or create if not existing
+    for item in items:
 
-    # this is a structure mapping a unique 'target' (the unit you want
-    # to record coverage for) and the test cases that target it. Each
-    # test case has a "pointer" to the target.
-    target_pointers: dict[str, set[str]] = {
-        target: set(pointers)
-        for target, pointers in request.config.cache.get(CACHE_TARGETS, {}).items()
-    }
+        # for each test, grab the first marker which is a pointer
+        maybe_mark = item.get_closest_marker("pointer")
+
+        if maybe_mark is None or is_skipped(item):
+            continue
+
+        try:
+            pointer = resolve_pointer_mark_target(maybe_mark)
+        except ValueError as err:
+            errors[item.nodeid] = err
+            continue
+
+        # this "nodeid" is the specific test case pointing to the target
+        target_pointers.setdefault(pointer.full_name, set()).add(item.nodeid)
+
+        # dotted names weren't imported so they may not exist
+        if isinstance(pointer.target, str):
+            string_pointers.add(pointer.full_name)
+
+    return target_pointers, string_pointers, errors
+
+
+def collect_item_markers(
+    items: Iterable[pytest.Item],
+    markers: set[str],
+) -> dict[str, list[str]]:
+    """Which of the markers each test with a pointer has."""
+
+    item_markers = {}
+    for item in items:
+
+        if item.get_closest_marker("pointer") is None:
+            continue
+
+        names = sorted(
+            {mark.name for mark in item.iter_markers() if mark.name in markers}
+        )
+        if len(names) > 0:
+            item_markers[item.nodeid] = names
+
+    return item_markers
+
+
+def pytest_collection_finish(session: pytest.Session) -> None:  # nochecklist:
+    """Record the pointers of all the collected tests in the cache.
+
+    The pointers stored by earlier runs are reconciled with the
+    collected tests once here, instead of in every test.
+
+    """
+
+    config = session.config
+
+    # the xdist controller doesn't collect
+    if is_disabled(config) or is_xdist_controller(config):
+        return
+
+    items = [*session.items, *config.stash.get(DESELECTED_ITEMS, [])]
 
-    # for this test, grab the first marker which is a pointer
-    maybe_mark = request.node.get_closest_marker("pointer")
+    current_pointers, string_pointers, errors = collect_item_pointers(items)
 
-    # if present we handle it
-    if maybe_mark is not None:
+    # invalid marks fail their test when it runs, on any worker
+    config.stash[POINTER_ERRORS] = errors
 
-        pointer = resolve_pointer_mark_target(maybe_mark)
+    # every worker collects the same tests so only the first one records them
+    if getattr(config, "workerinput", {}).get("workerid", "gw0") != "gw0":
+        return
 
-        # if there is no pointers to this target registered already,
-        # initialize a list to store them in
-        if pointer.full_name not in target_pointers:
-            target_pointers[pointer.full_name] = set()
+    root = config.rootpath
 
-        # then we add this "nodeid" which is the specific test case
-        target_pointers[pointer.full_name].add(request.node.nodeid)
+    # files given with a test id were only collected in part
+    partial_paths = set()
+    for arg in config.args:
+        if "::" in arg:
+            arg_path = (config.invocation_params.dir / nodeid_path(arg)).resolve()
+            if arg_path.is_relative_to(root):
+                partial_paths.add(arg_path.relative_to(root).as_posix())
 
-    # then save the updated pointers to the cache
-    request.config.cache.set(
+    timestamp = time.time()
+
+    reconciled = reconcile_pointers(
+        config.cache.get(CACHE_TARGETS, {}),
+        current_pointers,
+        (item.nodeid for item in items),
+        root,
+        partial_paths=partial_paths,
+        last_seen=config.cache.get(CACHE_LAST_SEEN, {}),
+        timestamp=timestamp,
+    )
+
+    config.cache.set(
         CACHE_TARGETS,
-        {target: list(pointers) for target, pointers in target_pointers.items()},
+        {
+            target: sorted(pointers)
+            for target, pointers in reconciled.target_pointers.items()
+        },
+    )
+    config.cache.set(CACHE_LAST_SEEN, reconciled.last_seen)
+
+    # the carried pointers may be dotted names too
+    string_pointers |= {
+        name
+        for name in config.cache.get(CACHE_FRESHNESS, {}).get("string_pointers", [])
+        if name in reconciled.target_pointers
+    }
+
+    # only the markers that rules ask for are kept
+    rule_markers = config.stash[PASS_RULES].markers()
+    if len(rule_markers) > 0:
+
+        pointer_markers = {
+            nodeid: markers
+            for nodeid, markers in config.cache.get(CACHE_POINTER_MARKERS, {}).items()
+            if nodeid in reconciled.carried
+        }
+        pointer_markers.update(collect_item_markers(items, rule_markers))
+
+        config.cache.set(CACHE_POINTER_MARKERS, pointer_markers)
+    config.cache.set(
+        CACHE_FRESHNESS,
+        {
+            "timestamp": timestamp,
+            "fresh": len(reconciled.fresh),
+            "carried": len(reconciled.carried),
+            "stale": len(reconciled.stale),
+            "string_pointers": sorted(string_pointers),
+        },
+    )
+
+
+def pytest_runtest_setup(item: pytest.Item) -> None:  # nochecklist:
+
+    error = item.config.stash.get(POINTER_ERRORS, {}).get(item.nodeid)
+    if error is not None:
+        raise error
+
+
+def resolve_source(config, start_dir: Path) -> tuple[Path, list[str], Path]:
+    """The source directory, exclude patterns and module search path from the options."""
+
+    # the collect option can also tell where to start within the project,
+    # otherwise it will collect a lot of wrong paths in virtualenvs etc.
+    source_dir = start_dir / config.option.checklist_collect
+
+    # parse the exclude paths
+    exclude_patterns = resolve_exclude_patterns(config.option.checklist_exclude)
+
+    # NOTE: This is important because this will enable correct
+    # resolution of the fully-qualified names of modules/functions
+    #
+    # TODO: Currently we make this optional and use the sys.path
+    # search as the legacy behavior. This is probably something that
+    # should be deprecated though.
+    #
+    # Optionally, constrain the search path for the
+    # modules. Automatically detect the root of the module from the
+    # 'checklist_collect' option based on an upward search of finding
+    # an __init__.py file.
+
+    module_search_path = resolve_module_search_path(
+        source_dir,
+        config.option.checklist_infer_search_module,
+    )
+
+    return source_dir, sorted(exclude_patterns), module_search_path
+
+
+def resolve_targets(
+    config,
+    start_dir: Path,
+    pointer_index: PointerIndex,
+) -> Iterable[Target]:
+    """Get the targets from the inventory, the daemon or by scanning the source.
+
+    The aliases found along with the targets are added to the pointer index.
+
+    """
+
+    # the targets were already scanned ahead of time
+    if config.option.checklist_inventory != "":
+
+        inventory_path = start_dir / config.option.checklist_inventory
+
+        if inventory_path.exists():
+            inventory = load_inventory(inventory_path)
+            pointer_index.add_aliases(inventory.aliases())
+
+            return it.chain.from_iterable(inventory.targets().values())
+
+        warnings.warn(
+            f"Checklist inventory {inventory_path} not found, scanning the source code.",
+            stacklevel=2,
+        )
+
+    source_dir, exclude_patterns, module_search_path = resolve_source(config, start_dir)
+
+    # a daemon may have the targets scanned already
+    if config.option.checklist_daemon_socket != "":
+
+        socket_path = start_dir / config.option.checklist_daemon_socket
+
+        daemon_inventory = request_scan(
+            socket_path,
+            source_dir,
+            exclude_patterns,
+            module_search_path,
+            timeout=config.option.checklist_daemon_timeout,
+        )
+
+        if daemon_inventory is not None:
+            pointer_index.add_aliases(daemon_inventory.aliases())
+
+            return it.chain.from_iterable(daemon_inventory.targets().values())
+
+        warnings.warn(
+            f"No checklist daemon answering on {socket_path}, scanning the source code.",
+            stacklevel=2,
+        )
+
+    # collect all the functions by scanning the source code
+    return iter_source_targets(
+        Source(source_dir, module_search_path, tuple(exclude_patterns)),
+        pointer_index,
     )
 
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtestloop(session) -> None:  # nochecklist:
 
-    if is_disabled(session.config):
+    # with xdist the controller reports for all the workers
+    if is_disabled(session.config) or is_xdist_worker(session.config):
         yield
     else:
 
@@ -190,83 +622,107 @@ def pytest_runtestloop(session) -> None:  # nochecklist:
 
         # after the runtestloop is finished we can generate the report etc.
 
-        target_pointers = session.config.cache.get(CACHE_TARGETS, {})
+        freshness = session.config.cache.get(CACHE_FRESHNESS, {})
+        string_pointers = set(freshness.get("string_pointers", []))
 
-        start_dir = Path(session.startdir)
-
-        # the collect option can also tell where to start within the project,
-        # otherwise it will collect a lot of wrong paths in virtualenvs etc.
-        source_dir = start_dir / session.config.option.checklist_collect
-
-        # parse the exclude paths
-        exclude_patterns = resolve_exclude_patterns(
-            session.config.option.checklist_exclude
+        # only the dotted name pointers can be to aliases
+        pointer_index = PointerIndex(
+            session.config.cache.get(CACHE_TARGETS, {}),
+            dotted_names=string_pointers,
         )
 
-        # collect all the functions by scanning the source code
+        start_dir = Path(session.startdir)
 
-        # first collect all files to look in
-        check_paths, _ = detect_files(source_dir, list(exclude_patterns))
+        # everything from here on is streamed target by target so only
+        # the summaries are held in memory
+        targets = resolve_targets(session.config, start_dir, pointer_index)
 
-        # NOTE: This is important because this will enable correct
-        # resolution of the fully-qualified names of modules/functions
-        #
-        # TODO: Currently we make this optional and use the sys.path
-        # search as the legacy behavior. This is probably something that
-        # should be deprecated though.
-        #
-        # Optionally, constrain the search path for the
-        # modules. Automatically detect the root of the module from the
-        # 'checklist_collect' option based on an upward search of finding
-        # an __init__.py file.
+        # do the report here so we can give the exit code, in pytest_sessionfinish
+        # you cannot alter the exit code
 
-        if session.config.option.checklist_infer_search_module:
+        target_min_pass = session.config.option.checklist_target_min_pass
+        fail_under = session.config.option.checklist_fail_under
 
-            maybe_module_path = find_top_level_module_dir(source_dir)
+        # tests that didn't run this time keep their earlier durations
+        durations = None
+        if DURATIONS in session.config.stash:
 
-            if maybe_module_path is None:
-                raise ValueError(
-                    f"No module search path resolved from --checklist-collect directory {source_dir}"
-                )
+            durations = merge_durations(
+                session.config.cache.get(CACHE_DURATIONS, {}),
+                session.config.stash[DURATIONS].durations,
+                set().union(*pointer_index.values()),
+            )
 
-            else:
-                module_search_path = maybe_module_path
+            session.config.cache.set(CACHE_DURATIONS, durations)
 
-        # the legacy behavior
-        else:
-            # grab the first matching path from sys.path
-            sys_paths = [Path(p) for p in sys.path]
-            matches = ({source_dir} | set(source_dir.parents)) & set(sys_paths)
-            module_search_path = min(matches)
+        rules = session.config.stash[PASS_RULES]
 
-        check_modules = resolve_fq_modules(
-            check_paths,
-            module_search_path,
+        # collect the pass/fails for all the units
+        target_reports = iter_reports(
+            targets,
+            pointer_index,
+            target_min_pass,
+            rules=rules,
+            pointer_markers=session.config.cache.get(CACHE_POINTER_MARKERS, {}),
+            durations=durations,
         )
 
-        targets = resolve_fq_targets(check_modules)
+        # everything that needs to see each of the reports as they pass
+        accumulator = ReportAccumulator(
+            num_worst=session.config.option.checklist_report_worst,
+            # only tally up the modules if something will use them
+            track_modules=(
+                session.config.option.checklist_report_rollup
+                or session.config.option.checklist_history
+            ),
+        )
+        sinks: list[Callable[[TargetReport], None]] = [accumulator.add]
 
-        # do the report here so we can give the exit code, in pytest_sessionfinish
-        # you cannot alter the exit code
+        # only the targets with pointers need to be kept to check the
+        # dotted name pointers all in one go at the end
+        pointed_targets: set[str] = set()
 
-        # collect the pass/fails for all the units
-        target_results = collect_case_passes(
-            target_pointers,
-            it.chain(*targets.values()),
-        )
+        def add_pointed_target(report: TargetReport) -> None:
+            if report.result.num_pointers > 0:
+                pointed_targets.add(report.result.target.fq_name())
 
-        target_min_pass = session.config.option.checklist_target_min_pass
-        fail_under = session.config.option.checklist_fail_under
+        if len(string_pointers) > 0:
+            sinks.append(add_pointed_target)
+
+        if session.config.option.checklist_history:
 
-        target_reports = []
-        for result in target_results:
+            history_path = session.config.cache.mkdir(CACHE_DIR) / HISTORY_FNAME
 
-            target_reports.append(
-                TargetReport(result, passes=result.num_pointers >= target_min_pass)
+            recorder = HistoryRecorder(
+                history_path,
+                commit_id=(
+                    session.config.option.checklist_history_commit
+                    or resolve_commit(start_dir)
+                ),
             )
+            sinks.append(recorder.add)
 
-        # test whether the whole thing passed
-        percent_passes, passes = is_passing(target_reports, fail_under)
+        # only the targets with pointers have a row in the matrix
+        matrix = CoverageMatrix()
+
+        def add_matrix_row(report: TargetReport) -> None:
+            if report.result.num_pointers > 0:
+                name = report.result.target.fq_name()
+                matrix.add(name, sorted(pointer_index[name]))
+
+        if session.config.option.checklist_matrix != "":
+            sinks.append(add_matrix_row)
+
+        # the baseline comparison needs them sorted so just keep the
+        # names and statuses
+        baseline_entries: list[tuple[str, bool]] = []
+
+        def add_baseline_entry(report: TargetReport) -> None:
+            if not report.result.target.ignored:
+                baseline_entries.append((report.result.target.fq_name(), report.passes))
+
+        if session.config.option.checklist_baseline != "":
+            sinks.append(add_baseline_entry)
 
         console = Console()
 
@@ -278,29 +734,149 @@ def pytest_runtestloop(session) -> None:  # nochecklist:
 
         console.print(f"Minimum number of pointers per target: {target_min_pass}")
 
+        if len(rules.rules) > 0:
+            console.print(f"Checklist rules for specific targets: {len(rules.rules)}")
+
+        if freshness.get("carried", 0) > 0 or freshness.get("stale", 0) > 0:
+            console.print(
+                f"Pointers from {freshness.get('fresh', 0)} collected tests, "
+                f"{freshness.get('carried', 0)} tests not collected in this run "
+                f"and dropped {freshness.get('stale', 0)} from deleted tests"
+            )
+
+        tapped_reports = tap(target_reports, sinks)
+
         if session.config.option.checklist_report:
 
-            report_padding = make_report(
-                target_reports,
+            report_lines = iter_report_lines(
+                tapped_reports,
                 show_ignored=session.config.option.checklist_report_ignored,
                 show_passing=session.config.option.checklist_report_passing,
+                show_durations=session.config.option.checklist_report_durations,
+            )
+
+            report_limit = session.config.option.checklist_report_limit
+            report_page = session.config.option.checklist_report_page
+
+            write_report(
+                console,
+                paginate(report_lines, limit=report_limit, page=report_page),
+                empty_message=(
+                    f"No targets on page {report_page} of the report."
+                    if report_limit > 0 and report_page > 1
+                    else "All targets covered!"
+                ),
+            )
+
+        # make sure the whole pipeline ran even if the report stopped early
+        drain(tapped_reports)
+
+        # test whether the whole thing passed
+        percent_passes, passes = accumulator.counts.is_passing(fail_under)
+
+        unresolved_pointers = find_unresolved_pointers(
+            string_pointers,
+            pointed_targets,
+            resolve=pointer_index.resolve,
+        )
+
+        if len(unresolved_pointers) > 0:
+
+            console.print(
+                "[yellow]Pointers to names which are not collected targets:[/yellow]"
+            )
+
+            for name in unresolved_pointers:
+                console.print(f"[yellow]    {name}[/yellow]")
+
+        if session.config.option.checklist_report_rollup:
+
+            console.print(
+                make_rollup_report(
+                    accumulator.module_counts,
+                    max_depth=session.config.option.checklist_rollup_depth,
+                    expand_worst=session.config.option.checklist_rollup_expand,
+                )
+            )
+
+        if session.config.option.checklist_report_durations:
+            console.print(make_duration_report(accumulator.module_durations))
+
+        worst_failures = accumulator.worst_failures()
+        if len(worst_failures) > 0:
+
+            console.print("[bold]Failing targets with the fewest pointers:[/bold]")
+
+            for line in iter_report_lines(worst_failures):
+                console.print(Text("    ") + line)
+
+        if session.config.option.checklist_history:
+
+            run_id = recorder.finish(accumulator.module_counts)
+
+            console.print(f"Recorded checklist run {run_id} to {history_path}")
+
+        if session.config.option.checklist_matrix != "":
+
+            matrix_path = start_dir / session.config.option.checklist_matrix
+            write_matrix(matrix_path, matrix)
+
+            console.print(
+                f"Wrote checklist matrix of {len(matrix.targets)} targets "
+                f"and {len(matrix.tests)} tests to {matrix_path}"
             )
 
-            console.print(report_padding)
+        target_str = f"Target was {fail_under}"
+
+        # in baseline mode only regressions fail instead of the threshold
+        if session.config.option.checklist_baseline != "":
+
+            baseline_path = start_dir / session.config.option.checklist_baseline
+            statuses = sorted(baseline_entries)
+
+            if session.config.option.checklist_update_baseline:
+
+                write_baseline(baseline_path, statuses)
+
+                console.print(f"Updated checklist baseline {baseline_path}")
+
+                passes = True
+
+            else:
+
+                if baseline_path.exists():
+                    baseline = read_baseline(baseline_path)
+                else:
+                    console.print(
+                        f"[yellow]No checklist baseline at {baseline_path}, all failing targets are new.[/yellow]"
+                    )
+                    baseline = iter(())
+
+                regressions = compare_baseline(baseline, statuses)
+
+                for name in regressions.lost:
+                    console.print(f"[red]LOST[/red] {name}")
+
+                for name in regressions.new_failing:
+                    console.print(f"[red]NEW [/red] {name}")
+
+                passes = regressions.passes()
+
+            target_str = f"Target was no regressions from {baseline_path}"
 
         if not passes:
 
             session.testsfailed = 1
 
             console.print(
-                f"[bold red]Checklist unit coverage failed. Target was {fail_under}, achieved {percent_passes}.[/bold red]"
+                f"[bold red]Checklist unit coverage failed. {target_str}, achieved {percent_passes}.[/bold red]"
             )
             console.print("")
 
         else:
 
             console.print(
-                f"[bold green]Checklist unit coverage passed! Target was {fail_under}, achieved {percent_passes}.[/bold green]"
+                f"[bold green]Checklist unit coverage passed! {target_str}, achieved {percent_passes}.[/bold green]"
             )
             console.print("")
 
@@ -1,27 +1,44 @@
+import inspect
 from dataclasses import dataclass
-from typing import Any, Callable
+from typing import Any, Callable, Iterable
 
 import pytest
 
 
 @dataclass
 class Pointer:
-    target: Callable[..., Any] | property
+    target: Callable[..., Any] | property | str
     full_name: str
 
 
-def resolve_target_pointer(target: Callable[..., Any] | property) -> Pointer:
-    # NOTE: currently only supports functions and properties
+def resolve_target_pointer(target: Callable[..., Any] | property | str) -> Pointer:
+    # NOTE: currently only supports functions, properties and dotted
+    # names of them
 
-    if isinstance(target, property):
+    # a dotted name is taken as is so that the target doesn't have to
+    # be imported, it is only checked against the scanned targets later
+    if isinstance(target, str):
+        if not all(part.isidentifier() for part in target.split(".")):
+            raise ValueError(f"Pointer target '{target}' is not a dotted name")
+
+        return Pointer(
+            target=target,
+            full_name=target,
+        )
+
+    elif isinstance(target, property):
         if target.fget is None:
             raise ValueError("Property getter must be set")
 
         module = target.fget.__module__
         qualname = target.fget.__qualname__
     else:
-        module = target.__module__
-        qualname = target.__qualname__
+        # decorators which return a new object usually keep the
+        # original behind `__wrapped__`, which is what was scanned
+        func = inspect.unwrap(target)
+
+        module = func.__module__
+        qualname = func.__qualname__
 
     full_name = f"{module}.{qualname}"
 
@@ -54,3 +71,21 @@ def resolve_pointer_mark_target(mark: pytest.Mark) -> Pointer:
         raise ValueError("No positional or kwarg given for pointer target.")
 
     return resolve_target_pointer(target)
+
+
+def find_unresolved_pointers(
+    pointer_names: Iterable[str],
+    target_names: set[str],
+    resolve: Callable[[str], str] | None = None,
+) -> list[str]:
+    """The pointed to names which aren't any of the scanned targets, sorted.
+
+    Names are first passed through `resolve`, if given, so that
+    pointers to aliases of targets aren't reported.
+
+    """
+
+    if resolve is None:
+        return sorted(set(pointer_names) - target_names)
+
+    return sorted(name for name in pointer_names if resolve(name) not in target_names)
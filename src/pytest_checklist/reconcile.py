@@ -0,0 +1,99 @@
+"""Reconciling the pointers stored by earlier runs with the collected tests."""
+
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Mapping
+
+
+@dataclass
+class ReconciledPointers:
+
+    target_pointers: dict[str, set[str]] = field(default_factory=dict)
+
+    # the time each pointing test was last collected at
+    last_seen: dict[str, float] = field(default_factory=dict)
+
+    # tests collected in this run
+    fresh: set[str] = field(default_factory=set)
+
+    # tests which weren't collected in this run but still exist
+    carried: set[str] = field(default_factory=set)
+
+    # tests which were renamed or deleted
+    stale: set[str] = field(default_factory=set)
+
+
+def nodeid_path(nodeid: str) -> str:
+    """The path of the file of a test node id, relative to the rootdir."""
+
+    return nodeid.split("::", 1)[0]
+
+
+def reconcile_pointers(
+    stored: Mapping[str, Iterable[str]],
+    current: Mapping[str, Iterable[str]],
+    collected: Iterable[str],
+    root: Path,
+    partial_paths: set[str] | None = None,
+    last_seen: Mapping[str, float] | None = None,
+    timestamp: float = 0.0,
+) -> ReconciledPointers:
+    """Combine the pointers of an earlier run with the ones just collected.
+
+    The pointers of collected tests are always taken from `current`.
+    Stored pointers of tests that weren't collected are carried over
+    unless the test is gone: its file doesn't exist anymore, or the
+    whole file was collected without it. Files in `partial_paths` were
+    only collected in part, e.g. given as `file.py::test` arguments.
+
+    """
+
+    if partial_paths is None:
+        partial_paths = set()
+
+    if last_seen is None:
+        last_seen = {}
+
+    # interned so the set operations mostly compare by identity
+    collected_ids = {sys.intern(nodeid) for nodeid in collected}
+    stored_pointers = {
+        target: {sys.intern(nodeid) for nodeid in nodeids}
+        for target, nodeids in stored.items()
+    }
+
+    missing = set().union(*stored_pointers.values()) - collected_ids
+
+    # only check each file once
+    whole_paths = {nodeid_path(nodeid) for nodeid in collected_ids} - partial_paths
+    gone_paths = {
+        path
+        for path in {nodeid_path(nodeid) for nodeid in missing}
+        if path in whole_paths or not (root / path).exists()
+    }
+
+    stale = {nodeid for nodeid in missing if nodeid_path(nodeid) in gone_paths}
+    carried = missing - stale
+
+    target_pointers: dict[str, set[str]] = {}
+    for target, nodeids in stored_pointers.items():
+        kept = nodeids & carried
+        if len(kept) > 0:
+            target_pointers[target] = kept
+
+    fresh: set[str] = set()
+    for target, current_nodeids in current.items():
+        current_ids = {sys.intern(nodeid) for nodeid in current_nodeids}
+        target_pointers.setdefault(target, set()).update(current_ids)
+        fresh |= current_ids
+
+    return ReconciledPointers(
+        target_pointers=target_pointers,
+        last_seen={
+            **{nodeid: last_seen.get(nodeid, timestamp) for nodeid in carried},
+            **{nodeid: timestamp for nodeid in fresh},
+        },
+        fresh=fresh,
+        carried=carried,
+        stale=stale,
+    )
@@ -1,68 +1,291 @@
 """Tools for generating reports"""
 
-from textwrap import dedent
+import itertools as it
+from typing import Iterable, Iterator, TypeVar
+
+from rich.console import Console
 from rich.padding import Padding
+from rich.text import Text
+from rich.tree import Tree
+
+from pytest_checklist.app import (
+    TargetReport,
+    CoverageCounts,
+    rollup_packages,
+    worst_modules,
+)
+from pytest_checklist.defaults import (
+    DEFAULT_REPORT_CHUNK_SIZE,
+    DEFAULT_ROLLUP_DEPTH,
+    DEFAULT_ROLLUP_EXPAND,
+)
+
+T = TypeVar("T")
+
+REPORT_INDENT = "    "
+
+
+def report_status(target_report: TargetReport) -> tuple[str, str]:
+    """The color and message for displaying the status of a target."""
+
+    # if it passes
+    if target_report.passes:
+        return "green", "PASS"
+
+    # doesn't pass but there are tests for it
+    elif target_report.result.num_pointers > 0:
+        return "blue", "FAIL"
+
+    elif target_report.result.target.ignored:
+        return "yellow", "IGNORE"
+
+    else:
+        return "red", "FAIL"
+
+
+def is_shown(
+    target_report: TargetReport,
+    show_ignored: bool = False,
+    show_passing: bool = False,
+) -> bool:
+
+    return not (
+        (not show_ignored and target_report.result.target.ignored)
+        or (not show_passing and target_report.passes)
+    )
+
+
+def iter_report_lines(
+    target_reports: Iterable[TargetReport],
+    show_ignored: bool = False,
+    show_passing: bool = False,
+    show_durations: bool = False,
+) -> Iterator[Text]:
+    """Lazily render the report line for each shown target.
+
+    The lines are styled directly instead of with markup so nothing
+    needs to be parsed when printing them. With `show_durations` the
+    time of the fastest pointing test is shown after the name.
+
+    """
 
-from pytest_checklist.app import TargetReport
+    for target_report in target_reports:
+
+        if not is_shown(target_report, show_ignored, show_passing):
+            continue
+
+        color, test_message_str = report_status(target_report)
+
+        line = Text.assemble(
+            (
+                f"{test_message_str: <7}{target_report.result.num_pointers: <2}",
+                color,
+            ),
+            " ",
+            target_report.result.target.fq_name(),
+        )
+
+        if show_durations and target_report.result.min_duration is not None:
+            line.append(
+                f" (fastest test {target_report.result.min_duration:.3f}s)", "dim"
+            )
+
+        yield line
 
 
 def make_report(
-    target_reports: list[TargetReport],
+    target_reports: Iterable[TargetReport],
     show_ignored: bool = False,
     show_passing: bool = False,
+) -> Padding:
+    """Render the whole report at once, `write_report` streams it instead."""
+
+    report_lines = list(iter_report_lines(target_reports, show_ignored, show_passing))
+
+    if len(report_lines) > 0:
+        report = Text("\n").join(
+            [
+                Text(
+                    "List of functions in project and the number of tests for them",
+                    "bold",
+                ),
+                Text(""),
+                *report_lines,
+            ]
+        )
+    else:
+        report = Text("All targets covered!", "bold")
+
+    return Padding(report, (2, 4), expand=False)
+
+
+def paginate(lines: Iterable[T], limit: int = 0, page: int = 1) -> Iterator[T]:
+    """Take only the lines of a page, pages are `limit` lines long.
+
+    A limit of zero or less means no limit.
+
+    """
+
+    if limit <= 0:
+        return iter(lines)
+
+    start = (max(page, 1) - 1) * limit
+
+    return it.islice(lines, start, start + limit)
+
+
+def write_report(
+    console: Console,
+    lines: Iterable[Text],
+    chunk_size: int = DEFAULT_REPORT_CHUNK_SIZE,
+    empty_message: str = "All targets covered!",
+) -> int:  # nochecklist: Just renders a display
+    """Print the report lines in chunks, returns the number of lines written.
+
+    When the console isn't a terminal the lines are written as plain
+    text directly to the file without going through rich.
+
+    """
+
+    line_it = iter(lines)
+    first_line = next(line_it, None)
+
+    def write_chunk(chunk: list[Text]) -> None:
+
+        if console.is_terminal:
+            console.print(
+                Text(REPORT_INDENT) + Text("\n" + REPORT_INDENT).join(chunk),
+                soft_wrap=True,
+            )
+        else:
+            console.file.write(
+                "".join(f"{REPORT_INDENT}{line.plain}\n" for line in chunk)
+            )
+
+    if first_line is None:
+        write_chunk([Text(empty_message, "bold")])
+        return 0
+
+    write_chunk(
+        [
+            Text(""),
+            Text(
+                "List of functions in project and the number of tests for them",
+                "bold",
+            ),
+            Text(""),
+        ]
+    )
+
+    num_lines = 0
+    for chunk_lines in batched(it.chain([first_line], line_it), chunk_size):
+        write_chunk(chunk_lines)
+        num_lines += len(chunk_lines)
+
+    write_chunk([Text("")])
+
+    return num_lines
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Group the items into lists of at most `size`."""
+
+    item_it = iter(items)
+
+    while batch := list(it.islice(item_it, size)):
+        yield batch
+
+
+def make_duration_report(
+    module_durations: dict[str, float],
 ) -> Padding:  # nochecklist: Just renders a display
 
-    def report_line(target_report: TargetReport):
+    lines = [
+        f"{duration:10.3f}s  {name}"
+        for name, duration in sorted(
+            module_durations.items(), key=lambda item: item[1], reverse=True
+        )
+    ]
 
-        # if it passes
-        if target_report.passes:
-            color = "green"
-            test_message_str = "PASS"
+    if len(lines) == 0:
+        return Padding("[bold]No test durations recorded[/bold]", (2, 4), expand=False)
 
-        # doesn't pass but there are tests for it
-        elif target_report.result.num_pointers > 0:
-            color = "blue"
-            test_message_str = "FAIL"
+    return Padding(
+        "[bold]Time spent in the tests pointing to each module[/bold]\n\n"
+        + "\n".join(lines),
+        (2, 4),
+        expand=False,
+    )
 
-        # if its ignored and passing
-        elif target_report.result.target.ignored and target_report.passes:
-            color = "cyan"
-            test_message_str = "IGNORE"
 
-        elif target_report.result.target.ignored:
-            color = "yellow"
-            test_message_str = "IGNORE"
+def make_rollup_report(
+    module_counts: dict[str, CoverageCounts],
+    max_depth: int = DEFAULT_ROLLUP_DEPTH,
+    expand_worst: int = DEFAULT_ROLLUP_EXPAND,
+) -> Padding:  # nochecklist: Just renders a display
+
+    def node_label(name: str, counts: CoverageCounts, highlight: bool) -> str:
+
+        percent = counts.percent_passes()
 
+        if percent == 100.0:
+            color = "green"
+        elif percent >= 50.0:
+            color = "yellow"
         else:
             color = "red"
-            test_message_str = "FAIL"
 
-        test_result_str = (
-            f"{test_message_str: <7}{target_report.result.num_pointers: <2}"
+        label = name.split(".")[-1]
+        if highlight:
+            label = f"[bold]{label}[/bold]"
+
+        return (
+            f"[{color}]{percent:6.2f}%[/{color}] {label} "
+            f"({counts.num_passes}/{counts.num_targets}, {counts.num_ignored} ignored)"
         )
 
-        return f"[{color}]{test_result_str:-<5}[/{color}] {target_report.result.target.fq_name()}"
+    package_counts = rollup_packages(module_counts)
+    expanded = worst_modules(module_counts, expand_worst)
 
-    report_lines = "\n".join(
-        [
-            report_line(target_report)
-            for target_report in target_reports
-            if not (
-                (not show_ignored and target_report.result.target.ignored)
-                or (not show_passing and target_report.passes)
-            )
-        ]
+    # everything down to the depth limit is always shown, below that
+    # only the branches leading to the worst modules are expanded
+    shown = {name for name in package_counts if name.count(".") < max_depth}
+    for module_name in expanded:
+        parts = module_name.split(".")
+        shown.update(".".join(parts[:idx]) for idx in range(1, len(parts) + 1))
+
+    children: dict[str, list[str]] = {}
+    for name in shown:
+        parent = name.rpartition(".")[0]
+        children.setdefault(parent, []).append(name)
+
+    total = CoverageCounts()
+    for counts in module_counts.values():
+        total.merge(counts)
+
+    tree = Tree(
+        "[bold]Checklist coverage rolled up by package and module[/bold]\n"
+        + node_label("(all)", total, highlight=False)
     )
 
-    if len(report_lines) > 0:
-        report = dedent(
-            f"""
-            [bold]List of functions in project and the number of tests for them[/bold]
+    def worst_first(names: list[str]) -> list[str]:
+        # reversed since the stack pops the last one pushed first
+        return sorted(
+            names,
+            key=lambda name: package_counts[name].percent_passes(),
+            reverse=True,
+        )
 
-            \n{report_lines}
-            """
+    # walk down from the top-level packages showing the worst first
+    stack = [(tree, name) for name in worst_first(children.get("", []))]
+    while len(stack) > 0:
+
+        branch, name = stack.pop()
+
+        node = branch.add(
+            node_label(name, package_counts[name], highlight=name in expanded)
         )
-    else:
-        report = dedent("[bold]All targets covered![/bold]")
 
-    return Padding(report, (2, 4), expand=False)
+        stack.extend((node, child) for child in worst_first(children.get(name, [])))
+
+    return Padding(tree, (2, 4), expand=False)
@@ -0,0 +1,193 @@
+"""Rules for how many pointers targets matching a pattern need to pass."""
+
+import fnmatch
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Mapping
+
+from pytest_checklist.app import TargetReport
+from pytest_checklist.collector import TargetResult
+
+MARKER_PREFIX = "marker="
+
+ROOT_GROUP_PREFIX = "rule"
+
+
+@dataclass(frozen=True)
+class PassRule:
+
+    # glob on the fully-qualified target name
+    pattern: str
+    min_pointers: int
+
+    # only count pointers from tests with this marker
+    marker: str | None = None
+
+
+def parse_rule(line: str) -> PassRule:
+    """Parse a rule written as `<pattern> <min pointers> [marker=<name>]`."""
+
+    parts = line.split()
+
+    if len(parts) not in (2, 3):
+        raise ValueError(
+            f"Checklist rule '{line}' should be '<pattern> <min pointers> [marker=<name>]'"
+        )
+
+    pattern, min_str, *options = parts
+
+    try:
+        min_pointers = int(min_str)
+    except ValueError as err:
+        raise ValueError(
+            f"Minimum pointers of checklist rule '{line}' is not an integer"
+        ) from err
+
+    marker = None
+    if len(options) > 0:
+
+        if not options[0].startswith(MARKER_PREFIX):
+            raise ValueError(
+                f"Unknown option '{options[0]}' in checklist rule '{line}'"
+            )
+
+        marker = options[0].removeprefix(MARKER_PREFIX)
+
+    return PassRule(pattern, min_pointers, marker)
+
+
+def literal_prefix(pattern: str) -> str:
+    """The start of a glob pattern before any wildcards."""
+
+    match = re.search(r"[*?[]", pattern)
+    if match is None:
+        return pattern
+
+    return pattern[: match.start()]
+
+
+class RuleMatcher:
+    """Finds the first rule whose pattern matches a target name.
+
+    The rules are put in a trie by the literal start of their patterns,
+    so walking it along a name finds the few rules that could match in
+    time linear in the length of the name, however many rules there are.
+
+    Rules starting with a wildcard could match any name, they are all
+    tried at once with a single regex of their patterns in order.
+
+    """
+
+    def __init__(self, rules: Iterable[PassRule]):  # nochecklist:
+
+        self.rules = list(rules)
+
+        self._regexes = [
+            re.compile(fnmatch.translate(rule.pattern)) for rule in self.rules
+        ]
+
+        # nested by character, the rules ending at a node are under `None`
+        self._trie: dict[str | None, Any] = {}
+
+        # the first alternative that matches is the earliest rule, named
+        # by its index
+        root_patterns = []
+
+        for idx, rule in enumerate(self.rules):
+
+            prefix = literal_prefix(rule.pattern)
+
+            if prefix == "":
+                root_patterns.append(
+                    f"(?P<{ROOT_GROUP_PREFIX}{idx}>{fnmatch.translate(rule.pattern)})"
+                )
+                continue
+
+            node = self._trie
+            for char in prefix:
+                node = node.setdefault(char, {})
+
+            node.setdefault(None, []).append(idx)
+
+        self._root_regex = (
+            re.compile("|".join(root_patterns)) if len(root_patterns) > 0 else None
+        )
+
+    def match(self, name: str) -> PassRule | None:
+
+        # the earliest of the rules starting with a wildcard
+        root_idx = len(self.rules)
+
+        if self._root_regex is not None:
+
+            root_match = self._root_regex.match(name)
+
+            if root_match is not None and root_match.lastgroup is not None:
+                root_idx = int(root_match.lastgroup.removeprefix(ROOT_GROUP_PREFIX))
+
+        candidates = []
+
+        node = self._trie
+        for char in name:
+
+            child = node.get(char)
+            if child is None:
+                break
+
+            node = child
+            candidates.extend(node.get(None, []))
+
+        # the rules are in order so the first one wins
+        for idx in sorted(candidates):
+
+            if idx > root_idx:
+                break
+
+            if self._regexes[idx].match(name) is not None:
+                return self.rules[idx]
+
+        if root_idx < len(self.rules):
+            return self.rules[root_idx]
+
+        return None
+
+    def markers(self) -> set[str]:
+        """The markers any of the rules require."""
+
+        return {rule.marker for rule in self.rules if rule.marker is not None}
+
+
+def iter_rule_reports(
+    results: Iterable[TargetResult],
+    matcher: RuleMatcher,
+    target_min_pass: int,
+    target_pointers: Mapping[str, Iterable[str]],
+    pointer_markers: Mapping[str, Iterable[str]],
+) -> Iterator[TargetReport]:
+    """Lazily decide whether each target passes by the rule matching it.
+
+    Targets no rule matches need `target_min_pass` pointers. Rules with
+    a marker only count the pointers from tests having that marker in
+    `pointer_markers`.
+
+    """
+
+    for result in results:
+
+        rule = matcher.match(result.target.fq_name())
+
+        if rule is None:
+            passes = result.num_pointers >= target_min_pass
+
+        elif rule.marker is None:
+            passes = result.num_pointers >= rule.min_pointers
+
+        else:
+            num_marked = sum(
+                1
+                for nodeid in target_pointers.get(result.target.fq_name(), ())
+                if rule.marker in pointer_markers.get(nodeid, ())
+            )
+            passes = num_marked >= rule.min_pointers
+
+        yield TargetReport(result, passes=passes)
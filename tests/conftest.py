@@ -0,0 +1,32 @@
+import itertools as it
+
+import pytest
+
+from pytest_checklist.inventory import Inventory
+
+
+@pytest.fixture
+def search_dir(tmp_path):
+    """A `mypackage` package under `src` with a single target, `foo`."""
+
+    package_dir = tmp_path / "src" / "mypackage"
+    package_dir.mkdir(parents=True)
+
+    (package_dir / "__init__.py").write_text("from mypackage.thing import foo as bar\n")
+    (package_dir / "thing.py").write_text("def foo():\n    pass\n")
+
+    return tmp_path / "src"
+
+
+@pytest.fixture
+def target_names():
+    """Gets the full names of some targets, or of all those of an inventory."""
+
+    def target_names(targets):
+
+        if isinstance(targets, Inventory):
+            targets = it.chain.from_iterable(targets.targets().values())
+
+        return {target.fq_name() for target in targets}
+
+    return target_names
@@ -2,7 +2,19 @@ from pathlib import Path
 
 import pytest
 
-from pytest_checklist.app import resolve_exclude_patterns, is_passing, TargetReport
+from pytest_checklist.app import (
+    resolve_exclude_patterns,
+    is_passing,
+    rollup_packages,
+    worst_modules,
+    iter_target_reports,
+    failure_rank,
+    tap,
+    drain,
+    CoverageCounts,
+    ReportAccumulator,
+    TargetReport,
+)
 from pytest_checklist.collector import TargetResult, Module, Target
 
 
@@ -67,3 +79,180 @@ def test_is_passing():
         ],
         0.0,
     )[1]
+
+
+def make_target_report(
+    fq_module_name: str, name: str, passes: bool, ignored: bool = False
+) -> TargetReport:
+
+    return TargetReport(
+        TargetResult(
+            Target(Module(Path("nothing"), fq_module_name), name, ignored=ignored),
+            1 if passes else 0,
+        ),
+        passes,
+    )
+
+
+class TestCoverageCounts:
+
+    @pytest.mark.pointer(target=CoverageCounts.add)
+    def test_add(self):
+
+        counts = CoverageCounts()
+        counts.add(make_target_report("a", "foo", True))
+        counts.add(make_target_report("a", "bar", False))
+        counts.add(make_target_report("a", "baz", False, ignored=True))
+
+        assert counts == CoverageCounts(num_targets=2, num_passes=1, num_ignored=1)
+
+    @pytest.mark.pointer(target=CoverageCounts.merge)
+    def test_merge(self):
+
+        counts = CoverageCounts(1, 1, 0)
+        counts.merge(CoverageCounts(3, 1, 2))
+
+        assert counts == CoverageCounts(4, 2, 2)
+
+    @pytest.mark.pointer(target=CoverageCounts.percent_passes)
+    def test_percent_passes(self):
+
+        assert CoverageCounts(0, 0, 0).percent_passes() == 100.0
+        assert CoverageCounts(4, 1, 0).percent_passes() == 25.0
+        assert CoverageCounts(4, 0, 0).percent_passes() == 0.0
+
+    @pytest.mark.pointer(target=CoverageCounts.is_passing)
+    def test_is_passing(self):
+
+        assert CoverageCounts(4, 1, 0).is_passing(20.0) == (25.0, True)
+        assert CoverageCounts(4, 1, 0).is_passing(50.0) == (25.0, False)
+
+
+@pytest.mark.pointer(target=rollup_packages)
+def test_rollup_packages():
+
+    package_counts = rollup_packages(
+        {
+            "pkg": CoverageCounts(1, 1, 0),
+            "pkg.a": CoverageCounts(2, 1, 0),
+            "pkg.sub.b": CoverageCounts(3, 0, 1),
+            "other": CoverageCounts(1, 0, 0),
+        }
+    )
+
+    assert package_counts == {
+        "pkg": CoverageCounts(6, 2, 1),
+        "pkg.a": CoverageCounts(2, 1, 0),
+        "pkg.sub": CoverageCounts(3, 0, 1),
+        "pkg.sub.b": CoverageCounts(3, 0, 1),
+        "other": CoverageCounts(1, 0, 0),
+    }
+
+
+@pytest.mark.pointer(target=worst_modules)
+def test_worst_modules():
+
+    module_counts = {
+        "pkg.a": CoverageCounts(2, 1, 0),
+        "pkg.b": CoverageCounts(4, 2, 0),
+        "pkg.c": CoverageCounts(3, 0, 0),
+        "pkg.d": CoverageCounts(3, 3, 0),
+    }
+
+    assert worst_modules(module_counts, 2) == ["pkg.c", "pkg.b"]
+    assert worst_modules(module_counts, 10) == ["pkg.c", "pkg.b", "pkg.a"]
+
+
+@pytest.mark.pointer(target=iter_target_reports)
+def test_iter_target_reports():
+
+    mod = Module(Path("nothing"), fq_module_name="nothing")
+
+    results = [
+        TargetResult(Target(mod, "foo"), 2),
+        TargetResult(Target(mod, "bar"), 1),
+    ]
+
+    assert list(iter_target_reports(results, 2)) == [
+        TargetReport(results[0], True),
+        TargetReport(results[1], False),
+    ]
+
+
+@pytest.mark.pointer(target=failure_rank)
+def test_failure_rank():
+
+    assert failure_rank(make_target_report("pkg.a", "foo", False)) == (
+        0,
+        "pkg.a.foo",
+    )
+
+
+class TestReportAccumulator:
+
+    @pytest.mark.pointer(target=ReportAccumulator.add)
+    def test_add(self):
+
+        accumulator = ReportAccumulator(track_modules=True)
+
+        accumulator.add(make_target_report("pkg.a", "foo", True))
+        accumulator.add(make_target_report("pkg.b", "bar", False))
+
+        assert accumulator.counts == CoverageCounts(2, 1, 0)
+        assert accumulator.module_counts == {
+            "pkg.a": CoverageCounts(1, 1, 0),
+            "pkg.b": CoverageCounts(1, 0, 0),
+        }
+
+        # modules aren't tracked by default
+        accumulator = ReportAccumulator()
+        accumulator.add(make_target_report("pkg.a", "foo", True))
+
+        assert accumulator.module_counts == {}
+
+        # the time of the tests is always added up
+        timed = make_target_report("pkg.a", "bar", True)
+        timed.result.total_duration = 1.5
+        accumulator.add(timed)
+        accumulator.add(timed)
+
+        assert accumulator.module_durations == {"pkg.a": 3.0}
+
+    @pytest.mark.pointer(target=ReportAccumulator.worst_failures)
+    def test_worst_failures(self):
+
+        accumulator = ReportAccumulator(num_worst=2)
+
+        for idx in reversed(range(10)):
+            accumulator.add(make_target_report("pkg.a", f"func_{idx}", False))
+
+        accumulator.add(make_target_report("pkg.a", "passing", True))
+        accumulator.add(make_target_report("pkg.a", "ignored", False, ignored=True))
+
+        assert [
+            report.result.target.name for report in accumulator.worst_failures()
+        ] == ["func_0", "func_1"]
+
+        assert ReportAccumulator().worst_failures() == []
+
+
+@pytest.mark.pointer(target=tap)
+def test_tap():
+
+    seen = []
+
+    tapped = tap(range(3), [seen.append, seen.append])
+
+    assert seen == []
+    assert list(tapped) == [0, 1, 2]
+    assert seen == [0, 0, 1, 1, 2, 2]
+
+
+@pytest.mark.pointer(target=drain)
+def test_drain():
+
+    seen = []
+
+    drain(tap(range(3), [seen.append]))
+
+    assert seen == [0, 1, 2]
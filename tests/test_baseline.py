@@ -0,0 +1,72 @@
+import pytest
+
+from pytest_checklist.baseline import (
+    BaselineRegressions,
+    write_baseline,
+    read_baseline,
+    compare_baseline,
+)
+
+pointer = pytest.mark.pointer
+
+
+class TestBaselineRegressions:
+
+    @pointer(target=BaselineRegressions.passes)
+    def test_passes(self):
+
+        assert BaselineRegressions().passes()
+        assert not BaselineRegressions(lost=["a.foo"]).passes()
+        assert not BaselineRegressions(new_failing=["a.foo"]).passes()
+
+
+@pointer(target=write_baseline)
+def test_write_baseline(tmp_path):
+
+    path = tmp_path / "baseline.txt"
+
+    write_baseline(path, [("a.bar", True), ("a.foo", False)])
+
+    assert path.read_text() == "a.bar\tPASS\na.foo\tFAIL\n"
+
+
+@pointer(target=read_baseline)
+def test_read_baseline(tmp_path):
+
+    path = tmp_path / "baseline.txt"
+
+    path.write_text("a.bar\tPASS\n\na.foo\tFAIL\n")
+    assert list(read_baseline(path)) == [("a.bar", True), ("a.foo", False)]
+
+    path.write_text("a.bar\tMAYBE\n")
+    with pytest.raises(ValueError):
+        list(read_baseline(path))
+
+
+@pointer(target=compare_baseline)
+def test_compare_baseline():
+
+    baseline = [
+        ("a.kept", True),
+        ("a.lost", True),
+        ("a.removed", True),
+        ("a.still_failing", False),
+        ("a.zfixed", False),
+    ]
+
+    current = [
+        ("a.added_failing", False),
+        ("a.added_passing", True),
+        ("a.kept", True),
+        ("a.lost", False),
+        ("a.still_failing", False),
+        ("a.zfixed", True),
+        ("a.znew", False),
+    ]
+
+    assert compare_baseline(baseline, current) == BaselineRegressions(
+        lost=["a.lost"],
+        new_failing=["a.added_failing", "a.znew"],
+    )
+
+    assert compare_baseline([], [("a.foo", True)]).passes()
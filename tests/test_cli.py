@@ -0,0 +1,46 @@
+import sys
+
+import pytest
+
+from pytest_checklist.cli import main, scan
+
+pointer = pytest.mark.pointer
+
+
+@pointer(target=scan)
+def test_scan(search_dir, target_names):
+
+    package_dir = search_dir / "mypackage"
+
+    (package_dir / "skipped.py").write_text("def bar():\n    pass\n")
+
+    inventory = scan(
+        package_dir.resolve(),
+        exclude="skipped.py",
+        infer_search_module=True,
+    )
+
+    assert inventory.search_path == search_dir.resolve()
+    assert target_names(inventory) == {"mypackage.thing.foo"}
+
+    # the search path is inferred by default, outside of sys.path too
+    assert scan(package_dir.resolve()).search_path == search_dir.resolve()
+
+    with pytest.raises(ValueError):
+        scan(package_dir.resolve(), infer_search_module=False)
+
+
+@pointer(target=scan)
+def test_scan_command(search_dir, monkeypatch):
+
+    # like a console script, without the working directory on sys.path
+    monkeypatch.chdir(search_dir)
+    monkeypatch.setattr(sys, "path", [p for p in sys.path if p not in ("", ".")])
+
+    assert main(["scan", "--collect", "mypackage", "-j", "1"]) == 0
+    assert (search_dir / "checklist-inventory.json").exists()
+
+    assert (
+        main(["scan", "--collect", "mypackage", "-j", "1", "--no-infer-search-module"])
+        == 1
+    )
@@ -1,3 +1,5 @@
+import ast
+
 import pytest
 from pathlib import Path
 
@@ -5,11 +7,31 @@ from pytest_checklist.collector import (
     resolve_fq_modules,
     detect_files,
     resolve_fq_targets,
+    collect_module_targets,
     collect_case_passes,
+    packages_first,
+    scan_module,
+    scan_modules,
+    iter_case_passes,
+    iter_fq_targets,
     Target,
     TargetResult,
     Module,
+    AliasCollector,
+    add_pointed_aliases,
+    collect_aliases,
+    dotted_name,
+    scan_aliases,
+    ModuleScan,
+    PointerIndex,
+    alias_name,
+    module_namespace,
+    header_pragmas,
+    read_header,
+    read_module_source,
+    resolve_relative_name,
 )
+from pytest_checklist import collector
 
 
 @pytest.mark.pointer(target=detect_files)
@@ -94,6 +116,582 @@ def test_resolve_fq_targets(datadir):
         assert found_modules == expected
 
 
+@pytest.mark.pointer(target=collect_module_targets)
+def test_collect_module_targets(datadir):
+
+    module = Module(
+        datadir / "resolve_fq_targets/mymodule/cases/ignored.py",
+        "mymodule.cases.ignored",
+    )
+
+    assert collect_module_targets(module) == {
+        Target(module, "Some.for_test", ignored=True),
+    }
+
+
+@pytest.mark.pointer(target=scan_module)
+def test_scan_module(datadir):
+
+    search_dir = datadir / "aliases"
+
+    package = Module(search_dir / "mymodule/__init__.py", "mymodule.__init__")
+    thing = Module(search_dir / "mymodule/thing.py", "mymodule.thing")
+    other = Module(search_dir / "mymodule/other.py", "mymodule.other")
+
+    # re-exports are named from the package, not the `__init__` module
+    assert scan_module(package) == ModuleScan(
+        targets=set(),
+        aliases={
+            "mymodule.foo": "mymodule.thing.foo",
+            "mymodule.renamed": "mymodule.thing.bar",
+        },
+    )
+
+    # imports and assignments in functions aren't aliases
+    assert scan_module(thing).aliases == {
+        "mymodule.thing.Some.alias": "mymodule.thing.Some.method",
+        "mymodule.thing.shortcut": "mymodule.thing.Some.method",
+    }
+    assert Target(thing, "cached") in scan_module(thing).targets
+
+    assert scan_module(other).aliases == {
+        "mymodule.other.thing_foo": "mymodule.thing.foo",
+        "mymodule.other.again": "mymodule.thing.foo",
+    }
+
+
+@pytest.mark.pointer(target=scan_module)
+def test_scan_module_ignores(datadir, tmp_path):
+
+    search_dir = datadir / "ignores"
+
+    placements = scan_module(Module(search_dir / "placements.py", "placements"))
+
+    assert {target.name for target in placements.targets if not target.ignored} == {
+        "in_body",
+        "Some.method",
+    }
+    assert len(placements.targets) == 11
+
+    module_pragma = scan_module(
+        Module(search_dir / "module_pragma.py", "module_pragma")
+    )
+
+    assert module_pragma.targets == {
+        Target(
+            Module(search_dir / "module_pragma.py", "module_pragma"),
+            "foo",
+            ignored=True,
+        )
+    }
+
+    # the rest of the file isn't even parsed
+    (tmp_path / "file_pragma.py").write_text(
+        "# nochecklist-file: not parsed\n\ndef foo(:\n    pass\n"
+    )
+
+    assert scan_module(Module(tmp_path / "file_pragma.py", "file_pragma")) == (
+        ModuleScan()
+    )
+
+
+@pytest.mark.pointer(target=read_header)
+def test_read_header(tmp_path):
+
+    (tmp_path / "mod.py").write_text(
+        "#!/usr/bin/env python\n\n# comment\nimport os\n# after\n"
+    )
+
+    with open(tmp_path / "mod.py") as source_file:
+        assert read_header(source_file) == [
+            "#!/usr/bin/env python\n",
+            "\n",
+            "# comment\n",
+            "import os\n",
+        ]
+        assert source_file.read() == "# after\n"
+
+
+@pytest.mark.pointer(target=header_pragmas)
+def test_header_pragmas():
+
+    assert header_pragmas(["# nochecklist-module: why\n", "x = 1\n"]) == {
+        "nochecklist-module:"
+    }
+    assert header_pragmas(["# nochecklist-file:\n"]) == {"nochecklist-file:"}
+
+    # only in comments
+    assert header_pragmas(['x = "nochecklist-file:"\n']) == set()
+
+
+@pytest.mark.pointer(target=scan_modules)
+def test_scan_modules(datadir):
+
+    search_dir = datadir / "aliases"
+
+    modules = resolve_fq_modules(
+        sorted((search_dir / "mymodule").glob("*.py")),
+        search_dir,
+    )
+
+    scans = scan_modules(modules)
+
+    assert scans == [scan_module(module) for module in modules]
+    assert scan_modules(modules, jobs=2) == scans
+
+
+@pytest.mark.pointer(target=packages_first)
+def test_packages_first():
+
+    modules = [
+        Module(Path("a/_impl.py"), "a._impl"),
+        Module(Path("a/sub/thing.py"), "a.sub.thing"),
+        Module(Path("a/sub/__init__.py"), "a.sub.__init__"),
+        Module(Path("a/__init__.py"), "a.__init__"),
+    ]
+
+    assert [
+        module.fq_module_name for module in sorted(modules, key=packages_first)
+    ] == [
+        "a.__init__",
+        "a._impl",
+        "a.sub.__init__",
+        "a.sub.thing",
+    ]
+
+
+@pytest.mark.pointer(target=resolve_fq_targets)
+def test_resolve_fq_targets_parallel(datadir):
+
+    search_dir = datadir / "resolve_fq_targets"
+
+    modules = resolve_fq_modules(
+        sorted((search_dir / "mymodule").glob("**/*.py")),
+        search_dir,
+    )
+
+    assert resolve_fq_targets(modules, jobs=2) == resolve_fq_targets(modules)
+
+
+@pytest.mark.pointer(target=iter_fq_targets)
+def test_iter_fq_targets(datadir):
+
+    search_dir = datadir / "resolve_fq_targets"
+
+    modules = resolve_fq_modules(
+        sorted((search_dir / "mymodule").glob("**/*.py")),
+        search_dir,
+    )
+
+    targets = iter_fq_targets(modules)
+
+    assert next(targets).module in modules
+    assert set(iter_fq_targets(modules)) == set().union(
+        *resolve_fq_targets(modules).values()
+    )
+
+    # the aliases of a module are known before its targets
+    alias_dir = datadir / "aliases"
+    alias_modules = resolve_fq_modules(
+        sorted((alias_dir / "mymodule").glob("*.py"), reverse=True),
+        alias_dir,
+    )
+
+    pointer_index = PointerIndex({"mymodule.thing.shortcut": {"test_a"}})
+    alias_targets = iter_fq_targets(alias_modules, pointer_index)
+
+    assert next(alias_targets).module.fq_module_name == "mymodule.thing"
+    assert pointer_index["mymodule.thing.Some.method"] == {"test_a"}
+
+
+@pytest.mark.pointer(target=iter_fq_targets)
+def test_iter_fq_targets_defined_first(tmp_path):
+
+    package_dir = tmp_path / "pkg"
+    package_dir.mkdir()
+
+    (package_dir / "__init__.py").write_text("")
+    (package_dir / "a_impl.py").write_text("def work():\n    pass\n")
+    (package_dir / "b_other.py").write_text("def other():\n    pass\n")
+    (package_dir / "zz_api.py").write_text("from pkg.a_impl import work\n")
+
+    modules = sorted(
+        resolve_fq_modules(sorted(package_dir.glob("*.py")), tmp_path),
+        key=packages_first,
+    )
+
+    pointer_index = PointerIndex(
+        {"pkg.zz_api.work": {"test_work"}, "pkg.b_other.other": {"test_other"}},
+        dotted_names=["pkg.zz_api.work"],
+    )
+
+    # the re-export comes after the module defining the target
+    results = iter_case_passes(pointer_index, iter_fq_targets(modules, pointer_index))
+
+    assert {result.target.fq_name(): result.num_pointers for result in results} == {
+        "pkg.a_impl.work": 1,
+        "pkg.b_other.other": 1,
+    }
+
+
+@pytest.mark.pointer(target=iter_fq_targets)
+def test_iter_fq_targets_streams(tmp_path, monkeypatch):
+
+    package_dir = tmp_path / "pkg"
+    package_dir.mkdir()
+
+    for idx in range(5):
+        (package_dir / f"m{idx}.py").write_text("def f():\n    pass\n")
+
+    modules = resolve_fq_modules(sorted(package_dir.glob("*.py")), tmp_path)
+
+    scanned = []
+
+    def record_scan(module):
+        scanned.append(module.fq_module_name)
+        return scan_module(module)
+
+    monkeypatch.setattr(collector, "scan_module", record_scan)
+
+    # a dotted pointer into the module scanned last
+    pointer_index = PointerIndex({"pkg.m4.f": {"test_f"}}, dotted_names=["pkg.m4.f"])
+    targets = iter_fq_targets(modules, pointer_index)
+
+    assert next(targets).fq_name() == "pkg.m0.f"
+    assert scanned == ["pkg.m0"]
+
+    # every pointer could be an alias without the dotted names
+    scanned.clear()
+    targets = iter_fq_targets(modules, PointerIndex({"pkg.m4.f": {"test_f"}}))
+
+    assert next(targets).fq_name() == "pkg.m0.f"
+    assert scanned == ["pkg.m0"]
+
+
+@pytest.mark.pointer(target=add_pointed_aliases)
+def test_add_pointed_aliases(tmp_path, monkeypatch):
+
+    package_dir = tmp_path / "pkg"
+    package_dir.mkdir()
+
+    (package_dir / "__init__.py").write_text("from pkg.api import work\n")
+    (package_dir / "api.py").write_text("from pkg.impl import work\n")
+    (package_dir / "impl.py").write_text("def work():\n    pass\n")
+    (package_dir / "other.py").write_text("from pkg.impl import work\n")
+
+    modules = resolve_fq_modules(sorted(package_dir.glob("*.py")), tmp_path)
+
+    scanned = []
+
+    def record_scan(module):
+        scanned.append(module.fq_module_name)
+        return scan_aliases(module)
+
+    monkeypatch.setattr(collector, "scan_aliases", record_scan)
+
+    pointer_index = PointerIndex({"pkg.work": {"test_work"}})
+    add_pointed_aliases(modules, pointer_index)
+
+    # the chain of re-exports is followed to the target
+    assert pointer_index == {"pkg.impl.work": {"test_work"}}
+    assert "pkg.other" not in scanned
+
+
+@pytest.mark.pointer(target=read_module_source)
+def test_read_module_source(tmp_path):
+
+    module_path = tmp_path / "mod.py"
+    module_path.write_text("# nochecklist-module:\n\ndef foo():\n    pass\n")
+
+    assert read_module_source(Module(module_path, "mod")) == (
+        "# nochecklist-module:\n\ndef foo():\n    pass\n",
+        {"nochecklist-module:"},
+    )
+
+    module_path.write_text("# nochecklist-file:\ndef foo():\n    pass\n")
+
+    assert read_module_source(Module(module_path, "mod")) is None
+
+
+@pytest.mark.pointer(target=scan_aliases)
+def test_scan_aliases(datadir, tmp_path):
+
+    search_dir = datadir / "aliases"
+
+    package = Module(search_dir / "mymodule/__init__.py", "mymodule.__init__")
+
+    assert scan_aliases(package) == scan_module(package).aliases
+
+    skipped = tmp_path / "skipped.py"
+    skipped.write_text("# nochecklist-file:\nfrom os import path\n")
+
+    assert scan_aliases(Module(skipped, "skipped")) == {}
+
+
+class TestPointerIndex:
+
+    @pytest.mark.pointer(target=PointerIndex.resolve)
+    def test_resolve(self):
+
+        pointer_index = PointerIndex({})
+        pointer_index.add_aliases({"a.foo": "b.foo", "b.foo": "c.foo"})
+
+        assert pointer_index.resolve("a.foo") == "c.foo"
+        assert pointer_index.resolve("c.foo") == "c.foo"
+
+    @pytest.mark.pointer(target=PointerIndex.add_aliases)
+    def test_add_aliases(self):
+
+        pointer_index = PointerIndex(
+            {
+                "a.foo": ["test_a"],
+                "b.foo": ["test_b", "test_c"],
+                "c.foo": ["test_a"],
+            }
+        )
+
+        # in any order the pointers end up on the final name
+        pointer_index.add_aliases({"b.foo": "c.foo"})
+        pointer_index.add_aliases({"a.foo": "b.foo"})
+
+        assert pointer_index == {"c.foo": {"test_a", "test_b", "test_c"}}
+
+        # loops are ignored
+        pointer_index.add_aliases({"c.foo": "a.foo"})
+
+        assert pointer_index.resolve("a.foo") == "c.foo"
+
+        # pointers to the real target aren't moved to an alias of the same name
+        pointer_index = PointerIndex(
+            {"pkg.compat.parse": ["test_parse"], "pkg.api.parse": ["test_api"]},
+            dotted_names=["pkg.api.parse"],
+        )
+
+        pointer_index.add_aliases(
+            {"pkg.compat.parse": "fastlib.parse", "pkg.api.parse": "pkg.compat.load"}
+        )
+        pointer_index.add_aliases({"pkg.compat.load": "pkg.compat.parse"})
+
+        assert pointer_index == {
+            "pkg.compat.parse": {"test_parse", "test_api"},
+        }
+        assert pointer_index.resolve("pkg.compat.parse") == "pkg.compat.parse"
+
+    @pytest.mark.pointer(target=PointerIndex.alias_namespaces)
+    def test_alias_namespaces(self):
+
+        pointer_index = PointerIndex(
+            {"pkg.api.work": ["test_work"], "pkg.impl.foo": ["test_foo"]},
+            dotted_names=["pkg.api.work", "pkg.gone"],
+        )
+
+        assert pointer_index.alias_namespaces() == {"pkg", "pkg.api"}
+
+        # without the dotted names every pointer could be to an alias
+        assert PointerIndex({"pkg.impl.foo": ["test_foo"]}).alias_namespaces() == {
+            "pkg",
+            "pkg.impl",
+        }
+
+    @pytest.mark.pointer(target=PointerIndex.is_dotted)
+    def test_is_dotted(self):
+
+        assert PointerIndex({}).is_dotted("a.foo")
+        assert PointerIndex({}, dotted_names=["a.foo"]).is_dotted("a.foo")
+        assert not PointerIndex({}, dotted_names=[]).is_dotted("a.foo")
+
+
+class TestAliasCollector:
+
+    @pytest.mark.pointer(target=AliasCollector.aliases)
+    def test_aliases(self):
+
+        collector = collect_alias_source(
+            "try:\n    from fastlib import parse\n"
+            "except ImportError:\n    def parse(x):\n        pass\n"
+            "def dump():\n    pass\n"
+            "dump = staticmethod\n"
+            "load = parse\n",
+            "pkg.compat",
+        )
+
+        # the functions defined in the module aren't aliases
+        assert collector.found == {"parse", "dump"}
+        assert collector.aliases() == {"pkg.compat.load": "pkg.compat.parse"}
+
+    @pytest.mark.pointer(target=AliasCollector.visit_Assign)
+    def test_visit_Assign(self):
+
+        collector = collect_alias_source(
+            "from os import path\n"
+            "def foo():\n    pass\n"
+            "bar = foo\n"
+            "join = path.join\n"
+            "num = 1\n"
+            "a = b = foo\n"
+            "printer = print\n",
+            "pkg.mod",
+        )
+
+        assert collector.aliases() == {
+            "pkg.mod.path": "os.path",
+            "pkg.mod.bar": "pkg.mod.foo",
+            "pkg.mod.join": "os.path.join",
+        }
+
+    @pytest.mark.pointer(target=AliasCollector.visit_ImportFrom)
+    def test_visit_ImportFrom(self):
+
+        collector = collect_alias_source(
+            "from . import thing\n"
+            "from ..other import foo as bar\n"
+            "from os.path import *\n"
+            "import json\n"
+            "class Some:\n    from os import sep\n",
+            "pkg.sub.__init__",
+        )
+
+        assert collector.aliases() == {"pkg.sub.bar": "pkg.other.foo"}
+
+    @pytest.mark.pointer(target=AliasCollector.visit_Import)
+    def test_visit_Import(self):
+
+        collector = collect_alias_source(
+            "import os.path\n"
+            "import json as js\n"
+            "sep = os.path.sep\n"
+            "load = js.load\n",
+            "pkg.mod",
+        )
+
+        assert collector.aliases() == {
+            "pkg.mod.sep": "os.path.sep",
+            "pkg.mod.load": "json.load",
+        }
+
+    @pytest.mark.pointer(target=AliasCollector.visit_FunctionDef)
+    def test_visit_FunctionDef(self):
+
+        collector = collect_alias_source(
+            "async def run():\n    from os import sep\n    inner = sep\n"
+            "start = run\n",
+            "pkg.mod",
+        )
+
+        # nothing in the function body is an alias
+        assert collector.found == {"run"}
+        assert collector.aliases() == {"pkg.mod.start": "pkg.mod.run"}
+
+    @pytest.mark.pointer(target=AliasCollector.visit_ClassDef)
+    def test_visit_ClassDef(self):
+
+        collector = collect_alias_source(
+            "class Some:\n"
+            "    def method(self):\n        pass\n"
+            "    alias = method\n"
+            "    class Inner:\n        pass\n"
+            "    inner = Inner\n"
+            "shortcut = Some.method\n",
+            "pkg.mod",
+        )
+
+        assert collector.found == {"Some.method"}
+        assert collector.aliases() == {
+            "pkg.mod.Some.alias": "pkg.mod.Some.method",
+            "pkg.mod.Some.inner": "pkg.mod.Some.Inner",
+            "pkg.mod.shortcut": "pkg.mod.Some.method",
+        }
+
+    @pytest.mark.pointer(target=AliasCollector.visit_Name)
+    def test_visit_Name(self):
+
+        collector = collect_alias_source(
+            "for json in []:\n    pass\n" "value = json\n" "other = print\n",
+            "pkg.mod",
+        )
+
+        # bound by the loop in the module
+        assert collector.aliases() == {"pkg.mod.value": "pkg.mod.json"}
+
+    @pytest.mark.pointer(target=AliasCollector.skip)
+    def test_skip(self):
+
+        collector = collect_alias_source(
+            "names = [name for name in []]\n" "value = name\n",
+            "pkg.mod",
+        )
+
+        # the comprehension variable isn't bound in the module
+        assert collector.aliases() == {}
+
+    @pytest.mark.pointer(target=AliasCollector.bind)
+    def test_bind(self):
+
+        collector = AliasCollector("pkg.mod")
+        collector.bind("parse", "fastlib.parse", imported=True)
+        collector.bind("parse", "parse")
+
+        assert collector.resolve("parse", "") == "pkg.mod.parse"
+
+    @pytest.mark.pointer(target=AliasCollector.resolve)
+    def test_resolve(self):
+
+        collector = collect_alias_source(
+            "from . import impl\n" "class Some:\n    impl = 1\n",
+            "pkg.mod",
+        )
+
+        assert collector.resolve("impl.foo", "") == "pkg.impl.foo"
+        assert collector.resolve("impl", "Some.") == "pkg.mod.Some.impl"
+        assert collector.resolve("print", "") is None
+
+
+def collect_alias_source(source: str, fq_module_name: str) -> AliasCollector:
+
+    collector = AliasCollector(fq_module_name)
+    collector.visit(ast.parse(source))
+
+    return collector
+
+
+@pytest.mark.pointer(target=dotted_name)
+def test_dotted_name():
+
+    assert dotted_name(ast.parse("a.b.c", mode="eval").body) == "a.b.c"
+    assert dotted_name(ast.parse("a().b", mode="eval").body) is None
+
+
+@pytest.mark.pointer(target=collect_aliases)
+def test_collect_aliases():
+
+    assert collect_aliases("from .impl import foo\n", "pkg.__init__") == {
+        "pkg.foo": "pkg.impl.foo"
+    }
+
+
+@pytest.mark.pointer(target=module_namespace)
+def test_module_namespace():
+
+    assert module_namespace("pkg.mod") == "pkg.mod"
+    assert module_namespace("pkg.__init__") == "pkg"
+
+
+@pytest.mark.pointer(target=alias_name)
+def test_alias_name():
+
+    assert alias_name("Some.foo", "pkg.mod") == "pkg.mod.Some.foo"
+    assert alias_name("foo", "pkg.__init__") == "pkg.foo"
+
+
+@pytest.mark.pointer(target=resolve_relative_name)
+def test_resolve_relative_name():
+
+    assert resolve_relative_name("os.path", "pkg.mod") == "os.path"
+    assert resolve_relative_name(".thing.foo", "pkg.mod") == "pkg.thing.foo"
+    assert resolve_relative_name("..foo", "pkg.sub.mod") == "pkg.foo"
+    assert resolve_relative_name(".foo", "pkg.sub.__init__") == "pkg.sub.foo"
+
+
 class TestTarget:
 
     @pytest.mark.pointer(target=Target.fq_name)
@@ -134,3 +732,37 @@ def test_collect_case_passes():
         TargetResult(Target(mod, "baz"), 0),
         TargetResult(Target(mod, "quux"), 0),
     ]
+
+
+@pytest.mark.pointer(target=iter_case_passes)
+def test_iter_case_passes():
+
+    mod = Module(Path("nomatter"), "mod.a")
+
+    results = iter_case_passes(
+        {"mod.a.foo": {"test_a", "test_b"}},
+        iter([Target(mod, "foo"), Target(mod, "bar")]),
+    )
+
+    assert next(results) == TargetResult(Target(mod, "foo"), 2)
+    assert next(results) == TargetResult(Target(mod, "bar"), 0)
+
+    # the time of the pointing tests is added up when known
+    timed = iter_case_passes(
+        {"mod.a.foo": {"test_a", "test_b", "test_c"}},
+        [Target(mod, "foo"), Target(mod, "bar")],
+        durations={"test_a": 0.5, "test_b": 2.0},
+    )
+
+    assert list(timed) == [
+        TargetResult(Target(mod, "foo"), 3, min_duration=0.5, total_duration=2.5),
+        TargetResult(Target(mod, "bar"), 0),
+    ]
+
+    # pointers to aliases count for what they refer to
+    pointer_index = PointerIndex({"mod.a.foo": {"test_a"}, "mod.b.foo": {"test_b"}})
+    pointer_index.add_aliases({"mod.b.foo": "mod.a.foo"})
+
+    assert list(iter_case_passes(pointer_index, [Target(mod, "foo")])) == [
+        TargetResult(Target(mod, "foo"), 2)
+    ]
@@ -0,0 +1,4 @@
+from .thing import foo
+from .thing import bar as renamed
+
+__all__ = ["foo", "renamed"]
@@ -0,0 +1,8 @@
+from .thing import foo as thing_foo
+
+
+def quick():
+    pass
+
+
+again = thing_foo
@@ -0,0 +1,31 @@
+import functools
+
+
+def foo():
+    pass
+
+
+def bar():
+    pass
+
+
+class Some:
+    def method(self):
+        pass
+
+    alias = method
+
+
+shortcut = Some.method
+
+
+def local_scope():
+    from .other import quick
+
+    inner = quick
+    return inner
+
+
+@functools.cache
+def cached():
+    pass
@@ -0,0 +1,6 @@
+#!/usr/bin/env python
+# nochecklist-module: generated code
+
+
+def foo():
+    pass
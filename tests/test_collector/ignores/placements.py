@@ -0,0 +1,54 @@
+import functools
+
+
+def header():  # nochecklist:
+    pass
+
+
+def one_line(): pass  # nochecklist:  # fmt: skip
+
+
+# nochecklist: comment above
+def above():
+    pass
+
+
+@functools.cache  # nochecklist: decorated
+def decorated():
+    pass
+
+
+def multiline(
+    first,  # nochecklist: in the signature
+    second,
+):
+    pass
+
+
+def closing_line(
+    first,
+    second,
+) -> None:  # nochecklist: after the signature
+    pass
+
+
+def in_body():
+    # nochecklist: doesn't count in the body
+    pass
+
+
+class IgnoredClass:  # nochecklist: whole class
+    def method(self):
+        pass
+
+    class Nested:
+        def method(self):
+            pass
+
+
+class Some:
+    def method(self):
+        pass
+
+    def ignored(self):  # nochecklist:
+        pass
@@ -0,0 +1,173 @@
+import socket
+import threading
+
+import pytest
+from libcst import ParserSyntaxError
+
+from pytest_checklist.daemon import (
+    TargetIndex,
+    TargetIndexServer,
+    remove_stale_socket,
+    request_scan,
+)
+
+pointer = pytest.mark.pointer
+
+
+@pytest.fixture
+def server(tmp_path):
+
+    server = TargetIndexServer(tmp_path / "daemon.sock", poll_interval=0.01)
+
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    thread.join()
+
+
+class TestTargetIndex:
+
+    @pointer(target=TargetIndex.refresh)
+    def test_refresh(self, search_dir, target_names):
+
+        index = TargetIndex(search_dir / "mypackage", [], search_dir)
+
+        assert target_names(index.refresh()) == {"mypackage.thing.foo"}
+
+        (search_dir / "mypackage/other.py").write_text("def bar():\n    pass\n")
+
+        assert target_names(index.refresh()) == {
+            "mypackage.thing.foo",
+            "mypackage.other.bar",
+        }
+
+    @pointer(target=TargetIndex.current)
+    def test_current(self, search_dir, target_names):
+
+        index = TargetIndex(search_dir / "mypackage", [], search_dir)
+
+        inventory = index.current()
+        assert target_names(inventory) == {"mypackage.thing.foo"}
+
+        # changes are only seen once refreshed
+        (search_dir / "mypackage/other.py").write_text("def bar():\n    pass\n")
+
+        assert index.current() is inventory
+
+        # a failed refresh is tried again
+        (search_dir / "mypackage/broken.py").write_text("def broken(:\n")
+
+        with pytest.raises(ParserSyntaxError):
+            index.refresh()
+
+        (search_dir / "mypackage/broken.py").unlink()
+
+        assert "mypackage.other.bar" in target_names(index.current())
+
+
+class TestTargetIndexServer:
+
+    @pointer(target=TargetIndexServer.get_index)
+    def test_get_index(self, tmp_path, search_dir):
+
+        server = TargetIndexServer(tmp_path / "daemon.sock")
+
+        index = server.get_index(search_dir, ["b.py", "a.py"], search_dir)
+
+        assert server.get_index(search_dir, ["a.py", "b.py"], search_dir) is index
+        assert server.get_index(search_dir, [], search_dir) is not index
+
+        server.server_close()
+
+
+@pointer(target=remove_stale_socket)
+def test_remove_stale_socket(tmp_path, server):
+
+    # nothing to remove
+    remove_stale_socket(tmp_path / "missing.sock")
+
+    with pytest.raises(RuntimeError):
+        remove_stale_socket(server.socket_path)
+
+    stale_path = tmp_path / "stale.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(str(stale_path))
+
+    remove_stale_socket(stale_path)
+
+    assert not stale_path.exists()
+
+    # other files are left alone
+    notes_path = tmp_path / "notes.txt"
+    notes_path.write_text("notes")
+
+    with pytest.raises(RuntimeError):
+        remove_stale_socket(notes_path)
+
+    assert notes_path.read_text() == "notes"
+
+
+@pointer(target=request_scan)
+def test_request_scan(tmp_path, search_dir, server, target_names):
+
+    inventory = request_scan(
+        server.socket_path,
+        search_dir / "mypackage",
+        [],
+        search_dir,
+        timeout=10,
+    )
+
+    assert inventory is not None
+    assert target_names(inventory) == {"mypackage.thing.foo"}
+
+    assert request_scan(tmp_path / "missing.sock", search_dir, [], search_dir) is None
+
+    # a daemon that doesn't answer in time is the same as no daemon
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as hung:
+        hung.bind(str(tmp_path / "hung.sock"))
+        hung.listen()
+
+        assert (
+            request_scan(
+                tmp_path / "hung.sock", search_dir, [], search_dir, timeout=0.1
+            )
+            is None
+        )
+
+    # a daemon closing the connection without answering
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as closing:
+        closing.bind(str(tmp_path / "closing.sock"))
+        closing.listen()
+
+        def close_connection():
+            connection, _ = closing.accept()
+
+            with connection, connection.makefile("rb") as stream:
+                stream.readline()
+
+        closer = threading.Thread(target=close_connection)
+        closer.start()
+
+        assert (
+            request_scan(
+                tmp_path / "closing.sock", search_dir, [], search_dir, timeout=10
+            )
+            is None
+        )
+
+        closer.join()
+
+    # errors while scanning are raised in the client, once the index
+    # has failed to refresh
+    (search_dir / "mypackage/broken.py").write_text("def broken(:\n")
+
+    for index in server.indexes.values():
+        with pytest.raises(ParserSyntaxError):
+            index.refresh()
+
+    with pytest.raises(RuntimeError):
+        request_scan(server.socket_path, search_dir / "mypackage", [], search_dir)
@@ -0,0 +1,38 @@
+import pytest
+
+from pytest_checklist.durations import DurationRecorder, merge_durations
+
+pointer = pytest.mark.pointer
+
+
+class TestDurationRecorder:
+
+    @pointer(target=DurationRecorder.pytest_runtest_logreport)
+    def test_pytest_runtest_logreport(self):
+
+        recorder = DurationRecorder()
+
+        for when, duration in [("setup", 0.5), ("call", 1.0), ("teardown", 0.25)]:
+            recorder.pytest_runtest_logreport(
+                pytest.TestReport(
+                    "tests/test_a.py::test_a",
+                    ("tests/test_a.py", 0, "test_a"),
+                    {},
+                    "passed",
+                    None,
+                    when,
+                    duration=duration,
+                )
+            )
+
+        assert recorder.durations == {"tests/test_a.py::test_a": 1.75}
+
+
+@pointer(target=merge_durations)
+def test_merge_durations():
+
+    assert merge_durations(
+        {"test_a": 1.0, "test_b": 2.0, "test_deleted": 3.0},
+        {"test_a": 0.5, "test_unpointed": 4.0},
+        {"test_a", "test_b", "test_never_ran"},
+    ) == {"test_a": 0.5, "test_b": 2.0}
@@ -0,0 +1,304 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+from pathlib import Path
+
+import pytest
+
+from pytest_checklist.collector import Module, PointerIndex, Target
+from pytest_checklist.engine import (
+    ChecklistEngine,
+    Source,
+    iter_reports,
+    iter_source_targets,
+    iter_until_cancelled,
+)
+from pytest_checklist.rules import PassRule, RuleMatcher
+
+pointer = pytest.mark.pointer
+
+
+@pytest.fixture
+def source(search_dir):
+    return Source(search_dir / "mypackage", search_dir)
+
+
+@pytest.fixture
+def engine():
+
+    with ChecklistEngine(max_workers=2, max_cached=2) as engine:
+        yield engine
+
+
+@pointer(target=iter_until_cancelled)
+def test_iter_until_cancelled():
+
+    cancel = threading.Event()
+
+    items = iter_until_cancelled(range(3), cancel)
+
+    assert next(items) == 0
+
+    cancel.set()
+
+    with pytest.raises(CancelledError):
+        next(items)
+
+
+@pointer(target=iter_source_targets)
+def test_iter_source_targets(source, target_names):
+
+    pointer_index = PointerIndex({"mypackage.bar": {"test_bar"}})
+
+    assert target_names(iter_source_targets(source, pointer_index)) == {
+        "mypackage.thing.foo"
+    }
+    assert pointer_index == {"mypackage.thing.foo": {"test_bar"}}
+
+    excluded = Source(source.source_dir, source.search_path, ("thing.py",))
+
+    assert target_names(iter_source_targets(excluded)) == set()
+
+
+@pointer(target=iter_reports)
+def test_iter_reports():
+
+    mod = Module(Path("pkg/mod.py"), "pkg.mod")
+    targets = [Target(mod, "foo"), Target(mod, "bar")]
+
+    target_pointers = {"pkg.mod.foo": {"t1", "t2"}, "pkg.mod.bar": {"t3"}}
+
+    reports = iter_reports(targets, target_pointers, target_min_pass=1)
+    assert [report.passes for report in reports] == [True, True]
+
+    rules = RuleMatcher([PassRule("pkg.mod.foo", 2), PassRule("*", 1, "unit")])
+    reports = iter_reports(
+        targets,
+        target_pointers,
+        rules=rules,
+        pointer_markers={"t3": ["slow"]},
+    )
+    assert [report.passes for report in reports] == [True, False]
+
+    cancel = threading.Event()
+    cancel.set()
+
+    with pytest.raises(CancelledError):
+        list(iter_reports(targets, target_pointers, cancel=cancel))
+
+
+class TestChecklistEngine:
+
+    @pointer(target=ChecklistEngine.index)
+    def test_index(self, engine, search_dir):
+
+        sources = [
+            Source(search_dir / "mypackage", search_dir, (name,))
+            for name in ["a.py", "b.py", "c.py"]
+        ]
+
+        index = engine.index(sources[0])
+        assert engine.index(sources[0]) is index
+
+        engine.index(sources[1])
+
+        # the first one was used last so the second one is dropped
+        engine.index(sources[0])
+        engine.index(sources[2])
+
+        assert engine.index(sources[0]) is index
+        assert set(engine._indexes) == {sources[0], sources[2]}
+
+    @pointer(target=ChecklistEngine.cached)
+    def test_cached(self, engine, source):
+
+        assert engine.cached(source) is None
+
+        inventory = engine.refresh(source)
+
+        assert engine.cached(source) is inventory
+
+    @pointer(target=ChecklistEngine.evict)
+    def test_evict(self, engine, source):
+
+        engine.refresh(source)
+        engine.evict(source)
+
+        assert engine.cached(source) is None
+
+        # nothing to evict
+        engine.evict(source)
+
+    @pointer(target=ChecklistEngine.clear)
+    def test_clear(self, engine, source):
+
+        engine.refresh(source)
+        engine.clear()
+
+        assert engine.cached(source) is None
+
+    @pointer(target=ChecklistEngine.refresh)
+    def test_refresh(self, engine, source, search_dir, target_names):
+
+        inventory = engine.refresh(source)
+
+        assert target_names(inventory) == {"mypackage.thing.foo"}
+
+        (search_dir / "mypackage/other.py").write_text("def baz():\n    pass\n")
+
+        assert "mypackage.other" in engine.refresh(source).targets()
+
+        cancel = threading.Event()
+        cancel.set()
+
+        with pytest.raises(CancelledError):
+            engine.refresh(source, cancel)
+
+    @pointer(target=ChecklistEngine.iter_targets)
+    def test_iter_targets(self, engine, source, target_names):
+
+        pointer_index = PointerIndex({"mypackage.bar": {"test_bar"}})
+
+        # streamed without caching
+        targets = engine.iter_targets(source, pointer_index)
+        assert target_names(targets) == {"mypackage.thing.foo"}
+        assert pointer_index == {"mypackage.thing.foo": {"test_bar"}}
+        assert engine.cached(source) is None
+
+        engine.refresh(source)
+
+        pointer_index = PointerIndex({"mypackage.bar": {"test_bar"}})
+
+        targets = engine.iter_targets(source, pointer_index)
+        assert target_names(targets) == {"mypackage.thing.foo"}
+        assert pointer_index == {"mypackage.thing.foo": {"test_bar"}}
+
+    @pointer(target=ChecklistEngine.submit)
+    def test_submit(self, engine):
+
+        future = engine.submit(lambda cancel: cancel.is_set())
+
+        assert future.result(timeout=10) is False
+
+        # the cancel events of finished futures aren't kept
+        assert engine._cancel_events == {}
+
+    @pointer(target=ChecklistEngine.cancel)
+    def test_cancel(self, engine):
+
+        started = threading.Event()
+
+        def wait_for_cancel(cancel):
+            started.set()
+            cancel.wait(timeout=10)
+            raise CancelledError()
+
+        running = engine.submit(wait_for_cancel)
+        started.wait(timeout=10)
+
+        assert engine.cancel(running)
+
+        with pytest.raises(CancelledError):
+            running.result(timeout=10)
+
+        # already finished
+        assert not engine.cancel(running)
+
+    @pointer(target=ChecklistEngine.cancel)
+    def test_cancel_scan(self, engine, source):
+
+        # keep the index busy so that the scan waits once it has started
+        index = engine.index(source)
+        with index._lock:
+
+            scan = engine.scan(source)
+
+            while not scan.running():
+                time.sleep(0.01)
+
+            assert not engine.cancel(scan)
+
+        # running scans aren't cancelled, though one that hadn't got to
+        # checking the cancel event yet still stops
+        scan.exception(timeout=10)
+        assert not scan.cancelled()
+
+        # queued scans are cancelled
+        with index._lock:
+
+            engine.submit(lambda cancel: index.refresh())
+            engine.submit(lambda cancel: index.refresh())
+            queued = engine.scan(source)
+
+            assert engine.cancel(queued)
+            assert queued.cancelled()
+
+    @pointer(target=ChecklistEngine.scan)
+    def test_scan(self, engine, source):
+
+        # keep the index busy so that the scans wait
+        index = engine.index(source)
+        with index._lock:
+
+            first = engine.scan(source)
+            second = engine.scan(source)
+
+            assert first is second
+
+        inventory = first.result(timeout=10)
+
+        assert "mypackage.thing" in inventory.targets()
+        assert engine.cached(source) is inventory
+
+        # a new scan once the last one is done
+        assert engine.scan(source) is not first
+
+    @pointer(target=ChecklistEngine.report)
+    def test_report(self, engine, source):
+
+        seen = []
+
+        future = engine.report(
+            source,
+            {"mypackage.bar": ["test_bar"]},
+            num_worst=1,
+            track_modules=True,
+            sinks=[seen.append],
+        )
+
+        accumulator = future.result(timeout=10)
+
+        assert accumulator.counts.num_passes == 1
+        assert set(accumulator.module_counts) == {"mypackage.thing"}
+        assert [report.result.target.fq_name() for report in seen] == [
+            "mypackage.thing.foo"
+        ]
+
+        failing = engine.report(source, {}, num_worst=1).result(timeout=10)
+
+        assert [
+            report.result.target.fq_name() for report in failing.worst_failures()
+        ] == ["mypackage.thing.foo"]
+
+    @pointer(target=ChecklistEngine.shutdown)
+    def test_shutdown(self, source):
+
+        engine = ChecklistEngine(max_workers=1)
+
+        started = threading.Event()
+
+        def wait_for_cancel(cancel):
+            started.set()
+            cancel.wait(timeout=10)
+            raise CancelledError()
+
+        running = engine.submit(wait_for_cancel)
+        queued = engine.scan(source)
+        started.wait(timeout=10)
+
+        engine.shutdown(cancel_futures=True)
+
+        assert queued.cancelled()
+
+        with pytest.raises(CancelledError):
+            running.result(timeout=10)
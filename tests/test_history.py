@@ -0,0 +1,196 @@
+from pathlib import Path
+
+import pytest
+
+from pytest_checklist.app import CoverageCounts, TargetReport
+from pytest_checklist.collector import Module, Target, TargetResult
+from pytest_checklist.history import (
+    Run,
+    HistoryRecorder,
+    connect,
+    resolve_commit,
+    list_runs,
+    lost_coverage_since,
+    package_trend,
+)
+
+pointer = pytest.mark.pointer
+
+
+def make_reports(statuses: dict[str, bool]) -> list[TargetReport]:
+
+    mod = Module(Path("nothing"), "pkg.a")
+
+    return [
+        TargetReport(TargetResult(Target(mod, name), int(passes)), passes)
+        for name, passes in statuses.items()
+    ]
+
+
+def record(
+    db_path: Path,
+    module_counts: dict[str, CoverageCounts],
+    statuses: dict[str, bool],
+    **kwargs,
+) -> int:
+
+    recorder = HistoryRecorder(db_path, **kwargs)
+
+    for report in make_reports(statuses):
+        recorder.add(report)
+
+    return recorder.finish(module_counts)
+
+
+def read_changes(db_path: Path) -> list[tuple[int, str, int | None]]:
+
+    connection = connect(db_path)
+    changes = connection.execute("""
+        SELECT run_id, name, target_changes.passes
+        FROM target_changes
+        JOIN targets ON targets.id = target_changes.target_id
+        ORDER BY run_id, name
+        """).fetchall()
+    connection.close()
+
+    return changes
+
+
+@pointer(target=connect)
+def test_connect(tmp_path):
+
+    connection = connect(tmp_path / "history.sqlite3")
+
+    tables = {
+        name
+        for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+    }
+
+    connection.close()
+
+    assert {"runs", "module_counts", "targets", "target_changes"} <= tables
+
+
+@pointer(target=resolve_commit)
+def test_resolve_commit(tmp_path):
+
+    assert resolve_commit(tmp_path) is None
+
+
+class TestHistoryRecorder:
+
+    @pointer(target=HistoryRecorder.add)
+    def test_add(self, tmp_path):
+
+        db_path = tmp_path / "history.sqlite3"
+
+        record(db_path, {}, {"foo": True, "bar": False})
+
+        recorder = HistoryRecorder(db_path)
+
+        for report in make_reports({"foo": True, "bar": True, "baz": False}):
+            recorder.add(report)
+
+        # only the changed and new targets are kept
+        assert [target_id for target_id, _ in recorder._changed] == [2]
+        assert recorder._new == [("pkg.a.baz", (0, 0, 0))]
+
+        # nothing is written until the end
+        assert len(list_runs(db_path)) == 1
+
+        recorder.finish({})
+
+    @pointer(target=HistoryRecorder.finish)
+    def test_finish(self, tmp_path):
+
+        db_path = tmp_path / "history.sqlite3"
+
+        assert (
+            record(
+                db_path,
+                {"pkg.a": CoverageCounts(2, 1, 0)},
+                {"foo": True, "bar": False},
+                commit_id="abc",
+                timestamp=1.0,
+            )
+            == 1
+        )
+        assert record(db_path, {}, {"foo": True, "bar": True}, timestamp=2.0) == 2
+        assert record(db_path, {}, {"foo": True}, timestamp=3.0) == 3
+        assert record(db_path, {}, {"foo": True, "bar": True}, timestamp=4.0) == 4
+
+        assert list_runs(db_path) == [
+            Run(1, "abc", 1.0),
+            Run(2, None, 2.0),
+            Run(3, None, 3.0),
+            Run(4, None, 4.0),
+        ]
+        assert package_trend(db_path, "pkg") == [
+            (Run(1, "abc", 1.0), CoverageCounts(2, 1, 0))
+        ]
+
+        # only the changes are recorded, removed targets with no status
+        assert read_changes(db_path) == [
+            (1, "pkg.a.bar", 0),
+            (1, "pkg.a.foo", 1),
+            (2, "pkg.a.bar", 1),
+            (3, "pkg.a.bar", None),
+            (4, "pkg.a.bar", 1),
+        ]
+
+
+@pointer(target=list_runs)
+def test_list_runs(tmp_path):
+
+    db_path = tmp_path / "history.sqlite3"
+
+    record(db_path, {}, {}, commit_id="abc", timestamp=1.0)
+    record(db_path, {}, {}, commit_id="def", timestamp=2.0)
+
+    assert list_runs(db_path) == [Run(1, "abc", 1.0), Run(2, "def", 2.0)]
+    assert list_runs(db_path, commit_id="def") == [Run(2, "def", 2.0)]
+
+
+@pointer(target=lost_coverage_since)
+def test_lost_coverage_since(tmp_path):
+
+    db_path = tmp_path / "history.sqlite3"
+
+    record(db_path, {}, {"foo": True, "bar": True, "baz": False, "qux": True})
+    record(db_path, {}, {"foo": False, "bar": True, "baz": True})
+    record(db_path, {}, {"foo": False, "bar": False, "baz": True})
+
+    # removed targets didn't lose coverage
+    assert lost_coverage_since(db_path, 1, run_id=2) == ["pkg.a.foo"]
+    assert lost_coverage_since(db_path, 1) == ["pkg.a.bar", "pkg.a.foo"]
+    assert lost_coverage_since(db_path, 2) == ["pkg.a.bar"]
+
+
+@pointer(target=package_trend)
+def test_package_trend(tmp_path):
+
+    db_path = tmp_path / "history.sqlite3"
+
+    record(
+        db_path,
+        {
+            "pkg": CoverageCounts(1, 1, 0),
+            "pkg.a": CoverageCounts(2, 1, 0),
+            "pkg_other": CoverageCounts(5, 0, 0),
+        },
+        {},
+        timestamp=1.0,
+    )
+    record(
+        db_path,
+        {"pkg.a": CoverageCounts(2, 2, 1)},
+        {},
+        timestamp=2.0,
+    )
+
+    assert package_trend(db_path, "pkg") == [
+        (Run(1, None, 1.0), CoverageCounts(3, 2, 0)),
+        (Run(2, None, 2.0), CoverageCounts(2, 2, 1)),
+    ]
@@ -0,0 +1,168 @@
+import os
+
+import pytest
+
+from pytest_checklist.collector import Module, Target
+from pytest_checklist.inventory import (
+    Inventory,
+    ModuleInventory,
+    scan_inventory,
+    scan_source,
+    inventory_to_dict,
+    inventory_from_dict,
+    write_inventory,
+    load_inventory,
+)
+
+pointer = pytest.mark.pointer
+
+
+@pytest.fixture
+def module(search_dir):
+
+    path = search_dir / "mypackage/thing.py"
+    path.write_text(path.read_text() + "\n\ndef bar():  # nochecklist:\n    pass\n")
+
+    return Module(path, "mypackage.thing")
+
+
+class TestModuleInventory:
+
+    @pointer(target=ModuleInventory.is_current)
+    def test_is_current(self, module):
+
+        stat = module.path.stat()
+        module_inv = ModuleInventory(module, stat.st_mtime_ns, stat.st_size)
+
+        assert module_inv.is_current()
+
+        os.utime(module.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert not module_inv.is_current()
+
+        module.path.unlink()
+        assert not module_inv.is_current()
+
+
+class TestInventory:
+
+    @pointer(target=Inventory.targets)
+    def test_targets(self, search_dir, module):
+
+        empty = Module(search_dir / "mypackage/__init__.py", "mypackage.__init__")
+
+        inventory = Inventory(
+            search_dir,
+            [
+                ModuleInventory(module, 0, 0, {Target(module, "foo")}),
+                ModuleInventory(empty, 0, 0, set()),
+            ],
+        )
+
+        assert inventory.targets() == {"mypackage.thing": {Target(module, "foo")}}
+
+    @pointer(target=Inventory.aliases)
+    def test_aliases(self, search_dir, module):
+
+        package = Module(search_dir / "mypackage/__init__.py", "mypackage.__init__")
+
+        inventory = Inventory(
+            search_dir,
+            [
+                ModuleInventory(module, 0, 0, aliases={"mypackage.thing.baz": "os"}),
+                ModuleInventory(
+                    package, 0, 0, aliases={"mypackage.foo": "mypackage.thing.foo"}
+                ),
+            ],
+        )
+
+        assert inventory.aliases() == {
+            "mypackage.thing.baz": "os",
+            "mypackage.foo": "mypackage.thing.foo",
+        }
+
+
+@pointer(target=scan_inventory)
+def test_scan_inventory(search_dir, module):
+
+    inventory = scan_inventory([module], search_dir)
+
+    assert inventory.targets() == {
+        "mypackage.thing": {
+            Target(module, "foo"),
+            Target(module, "bar", ignored=True),
+        }
+    }
+
+    # unchanged modules are reused from the previous inventory
+    previous = Inventory(
+        search_dir,
+        [
+            ModuleInventory(
+                module,
+                inventory.modules[0].mtime_ns,
+                inventory.modules[0].size,
+                {Target(module, "cached")},
+            )
+        ],
+    )
+
+    assert scan_inventory([module], search_dir, previous=previous).targets() == {
+        "mypackage.thing": {Target(module, "cached")}
+    }
+
+
+@pointer(target=scan_source)
+def test_scan_source(search_dir, module):
+
+    (search_dir / "mypackage/skipped.py").write_text("def baz():\n    pass\n")
+
+    inventory = scan_source(search_dir / "mypackage", ["skipped.py"], search_dir)
+
+    assert inventory.targets() == scan_inventory([module], search_dir).targets()
+
+
+@pointer(target=inventory_to_dict)
+def test_inventory_to_dict(search_dir, module):
+
+    inventory = scan_inventory([module], search_dir)
+
+    data = inventory_to_dict(inventory)
+
+    assert data["search_path"] == str(search_dir)
+    assert data["modules"][0]["path"] == "mypackage/thing.py"
+    assert data["modules"][0]["targets"] == [["bar", True], ["foo", False]]
+    assert data["modules"][0]["aliases"] == {}
+
+
+@pointer(target=inventory_from_dict)
+def test_inventory_from_dict(search_dir, module):
+
+    inventory = scan_inventory([module], search_dir)
+
+    assert inventory_from_dict(inventory_to_dict(inventory)) == inventory
+
+    with pytest.raises(ValueError):
+        inventory_from_dict({"version": 0})
+
+
+@pointer(target=write_inventory)
+def test_write_inventory(tmp_path, search_dir, module):
+
+    inventory = scan_inventory([module], search_dir)
+
+    write_inventory(tmp_path / "inventory.json", inventory)
+
+    assert (tmp_path / "inventory.json").exists()
+
+
+@pointer(target=load_inventory)
+def test_load_inventory(tmp_path, search_dir, module):
+
+    inventory = scan_inventory([module], search_dir)
+    write_inventory(tmp_path / "inventory.json", inventory)
+
+    assert load_inventory(tmp_path / "inventory.json") == inventory
+
+    (tmp_path / "inventory.json").write_text('{"version": 0}')
+    with pytest.raises(ValueError):
+        load_inventory(tmp_path / "inventory.json")
@@ -0,0 +1,118 @@
+import pytest
+
+from pytest_checklist.matrix import (
+    CoverageMatrix,
+    minimal_test_set,
+    matrix_to_dict,
+    matrix_from_dict,
+    write_matrix,
+    load_matrix,
+)
+
+pointer = pytest.mark.pointer
+
+
+@pytest.fixture
+def matrix():
+
+    matrix = CoverageMatrix()
+
+    matrix.add("mod.foo", ["test_a", "test_b"])
+    matrix.add("mod.bar", ["test_b"])
+    matrix.add("mod.baz", ["test_b", "test_c"])
+    matrix.add("mod.quux", ["test_c"])
+
+    return matrix
+
+
+class TestCoverageMatrix:
+
+    @pointer(target=CoverageMatrix.add)
+    def test_add(self, matrix):
+
+        assert matrix.targets == ["mod.foo", "mod.bar", "mod.baz", "mod.quux"]
+        assert matrix.tests == ["test_a", "test_b", "test_c"]
+        assert list(matrix.indptr) == [0, 2, 3, 5, 6]
+        assert list(matrix.indices) == [0, 1, 1, 1, 2, 2]
+
+    @pointer(target=CoverageMatrix.transpose)
+    def test_transpose(self, matrix):
+
+        indptr, indices = matrix.transpose()
+
+        assert list(indptr) == [0, 1, 4, 6]
+        assert list(indices) == [0, 0, 1, 2, 2, 3]
+
+        # rebuilt after adding more
+        matrix.add("mod.other", ["test_a"])
+
+        assert list(matrix.transpose()[1]) == [0, 4, 0, 1, 2, 2, 3]
+
+    @pointer(target=CoverageMatrix.tests_for_target)
+    def test_tests_for_target(self, matrix):
+
+        assert matrix.tests_for_target("mod.baz") == ["test_b", "test_c"]
+        assert matrix.tests_for_target("mod.missing") == []
+
+    @pointer(target=CoverageMatrix.targets_for_test)
+    def test_targets_for_test(self, matrix):
+
+        assert matrix.targets_for_test("test_b") == ["mod.foo", "mod.bar", "mod.baz"]
+        assert matrix.targets_for_test("test_missing") == []
+
+
+@pointer(target=minimal_test_set)
+def test_minimal_test_set(matrix):
+
+    assert minimal_test_set(matrix) == ["test_b", "test_c"]
+    assert minimal_test_set(CoverageMatrix()) == []
+
+    # every target is covered by the picked tests
+    big = CoverageMatrix()
+    for idx in range(200):
+        big.add(f"mod.f{idx}", [f"test_{idx % 7}", f"test_{idx % 13}"])
+
+    covered = {
+        target
+        for test in minimal_test_set(big)
+        for target in big.targets_for_test(test)
+    }
+    assert covered == set(big.targets)
+
+
+@pointer(target=matrix_to_dict)
+def test_matrix_to_dict(matrix):
+
+    data = matrix_to_dict(matrix)
+
+    assert data["tests"] == ["test_a", "test_b", "test_c"]
+    assert data["indptr"] == [0, 2, 3, 5, 6]
+
+
+@pointer(target=matrix_from_dict)
+def test_matrix_from_dict(matrix):
+
+    loaded = matrix_from_dict(matrix_to_dict(matrix))
+
+    assert loaded == matrix
+    assert loaded.targets_for_test("test_c") == ["mod.baz", "mod.quux"]
+
+    with pytest.raises(ValueError):
+        matrix_from_dict({"version": 0})
+
+
+@pointer(target=write_matrix)
+def test_write_matrix(tmp_path, matrix):
+
+    write_matrix(tmp_path / "matrix.json", matrix)
+
+    assert load_matrix(tmp_path / "matrix.json") == matrix
+
+
+@pointer(target=load_matrix)
+def test_load_matrix(tmp_path):
+
+    (tmp_path / "matrix.json").write_text('{"version": 0}')
+
+    with pytest.raises(ValueError, match="Invalid matrix"):
+        load_matrix(tmp_path / "matrix.json")
@@ -0,0 +1,46 @@
+import libcst as cst
+import pytest
+
+from pytest_checklist.parsing import (
+    collect_method_names,
+    has_comment,
+    has_ignore_comment,
+)
+
+
+@pytest.mark.pointer(target=has_comment)
+def test_has_comment():
+
+    module = cst.parse_module("x = [\n    1,  # a token\n]\n")
+
+    assert has_comment(module, "token")
+    assert not has_comment(module, "other")
+
+
+@pytest.mark.pointer(target=has_ignore_comment)
+def test_has_ignore_comment():
+
+    def first_def(source: str):
+        return cst.parse_module(source).body[0]
+
+    assert has_ignore_comment(first_def("def f():  # nochecklist:\n    pass\n"))
+    assert has_ignore_comment(first_def("def f(): pass  # nochecklist:\n"))
+    assert has_ignore_comment(first_def("@d  # nochecklist:\ndef f():\n    pass\n"))
+    assert has_ignore_comment(
+        first_def("def f(\n    a,  # nochecklist:\n):\n    pass\n")
+    )
+    assert has_ignore_comment(first_def("class A:  # nochecklist:\n    pass\n"))
+    assert not has_ignore_comment(first_def("def f():\n    # nochecklist:\n    pass\n"))
+
+
+@pytest.mark.pointer(target=collect_method_names)
+def test_collect_method_names():
+
+    found, ignored = collect_method_names(
+        "def foo():\n    def inner():\n        pass\n"
+        "class Some:  # nochecklist:\n    def method(self):\n        pass\n",
+        "pkg.mod",
+    )
+
+    assert found == {"foo", "Some.method"}
+    assert ignored == {"Some.method"}
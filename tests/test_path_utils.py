@@ -0,0 +1,56 @@
+import sys
+
+import pytest
+
+from pytest_checklist.path_utils import (
+    find_top_level_module_dir,
+    resolve_module_search_path,
+)
+
+pointer = pytest.mark.pointer
+
+
+@pytest.fixture
+def package_tree(tmp_path):
+
+    package_dir = tmp_path / "src" / "mypackage" / "sub"
+    package_dir.mkdir(parents=True)
+
+    (package_dir.parent / "__init__.py").write_text("")
+    (package_dir / "__init__.py").write_text("")
+
+    return tmp_path
+
+
+@pointer(target=find_top_level_module_dir)
+def test_find_top_level_module_dir(package_tree):
+
+    src_dir = (package_tree / "src").resolve()
+
+    assert find_top_level_module_dir(package_tree / "src/mypackage/sub") == src_dir
+    assert find_top_level_module_dir(package_tree / "src") == src_dir
+    assert find_top_level_module_dir(package_tree) is None
+
+
+@pointer(target=resolve_module_search_path)
+def test_resolve_module_search_path(package_tree, monkeypatch):
+
+    package_dir = package_tree / "src/mypackage"
+
+    assert (
+        resolve_module_search_path(package_dir, True)
+        == (package_tree / "src").resolve()
+    )
+
+    with pytest.raises(ValueError):
+        resolve_module_search_path(package_tree, True)
+
+    monkeypatch.setattr(sys, "path", [str(package_tree)])
+
+    assert resolve_module_search_path(package_dir, False) == package_tree
+
+    # not under any of the paths
+    monkeypatch.setattr(sys, "path", [str(package_tree / "other")])
+
+    with pytest.raises(ValueError):
+        resolve_module_search_path(package_dir, False)
@@ -0,0 +1,311 @@
+# pytester unloads the modules imported during each test, import the
+# native parser now as it can't be imported a second time
+import libcst.native  # noqa: F401
+import pytest
+
+from pytest_checklist.cli import scan
+from pytest_checklist.collector import PointerIndex
+from pytest_checklist.inventory import write_inventory
+from pytest_checklist.plugin import (
+    collect_item_markers,
+    collect_item_pointers,
+    is_disabled,
+    is_skipped,
+    is_xdist_controller,
+    is_xdist_worker,
+    resolve_source,
+    resolve_targets,
+)
+
+pointer = pytest.mark.pointer
+
+CHECKLIST_ARGS = [
+    "--checklist-collect=src",
+    "--checklist-infer-search-module",
+    "-p",
+    "no:randomly",
+    "-W",
+    "ignore::DeprecationWarning",
+]
+
+
+@pytest.fixture
+def project(pytester):
+
+    pytester.mkdir("src")
+    pytester.mkpydir("src/pkg")
+    pytester.path.joinpath("src/pkg/mod.py").write_text(
+        "def foo():\n    pass\n\n\ndef bar():\n    pass\n"
+    )
+
+    pytester.mkdir("tests")
+    pytester.path.joinpath("tests/test_mod.py").write_text(
+        "import pytest\n\n"
+        "@pytest.mark.pointer('pkg.mod.foo')\n"
+        "def test_foo():\n    pass\n\n"
+        "@pytest.mark.pointer('pkg.mod.bar')\n"
+        "def test_bar():\n    pass\n"
+    )
+
+    return pytester
+
+
+def run_checklist(pytester, *args):
+    return pytester.runpytest_subprocess(*CHECKLIST_ARGS, *args)
+
+
+@pointer(target=collect_item_pointers)
+def test_collect_item_pointers(pytester):
+
+    items = pytester.getitems(
+        "import pytest\n\n"
+        "def target():\n    pass\n\n"
+        "@pytest.mark.pointer(target=target)\n"
+        "def test_callable():\n    pass\n\n"
+        "@pytest.mark.pointer('pkg.mod.foo')\n"
+        "def test_dotted():\n    pass\n\n"
+        "@pytest.mark.pointer('not a name')\n"
+        "def test_invalid():\n    pass\n\n"
+        "def test_none():\n    pass\n"
+    )
+
+    target_pointers, string_pointers, errors = collect_item_pointers(items)
+
+    assert {
+        name.rsplit(".", 1)[-1]: {nodeid.rsplit("::", 1)[-1] for nodeid in nodeids}
+        for name, nodeids in target_pointers.items()
+    } == {"target": {"test_callable"}, "foo": {"test_dotted"}}
+    assert string_pointers == {"pkg.mod.foo"}
+    assert [nodeid.rsplit("::", 1)[-1] for nodeid in errors] == ["test_invalid"]
+
+
+@pointer(target=collect_item_markers)
+def test_collect_item_markers(pytester):
+
+    pytester.makeini("[pytest]\nmarkers =\n    unit\n    slow\n    other\n")
+
+    items = pytester.getitems(
+        "import pytest\n\n"
+        "@pytest.mark.unit\n"
+        "@pytest.mark.slow\n"
+        "@pytest.mark.pointer('pkg.mod.foo')\n"
+        "def test_marked():\n    pass\n\n"
+        "@pytest.mark.other\n"
+        "@pytest.mark.pointer('pkg.mod.foo')\n"
+        "def test_other():\n    pass\n\n"
+        "@pytest.mark.unit\n"
+        "def test_no_pointer():\n    pass\n"
+    )
+
+    item_markers = collect_item_markers(items, {"unit", "slow"})
+
+    assert {
+        nodeid.rsplit("::", 1)[-1]: names for nodeid, names in item_markers.items()
+    } == {"test_marked": ["slow", "unit"]}
+
+
+@pointer(target=is_skipped)
+def test_is_skipped(pytester):
+
+    items = pytester.getitems(
+        "import sys\n"
+        "import pytest\n\n"
+        "@pytest.mark.skip\n"
+        "def test_skip():\n    pass\n\n"
+        "@pytest.mark.skipif(sys.maxsize > 0, reason='always')\n"
+        "def test_skipif_true():\n    pass\n\n"
+        "@pytest.mark.skipif('sys.maxsize < 0')\n"
+        "def test_skipif_false():\n    pass\n\n"
+        "@pytest.mark.skipif('not a condition')\n"
+        "def test_skipif_invalid():\n    pass\n\n"
+        "def test_run():\n    pass\n"
+    )
+
+    assert [item.name for item in items if is_skipped(item)] == [
+        "test_skip",
+        "test_skipif_true",
+    ]
+
+
+@pointer(target=is_disabled)
+def test_is_disabled(pytester):
+
+    assert is_disabled(pytester.parseconfig())
+    assert not is_disabled(pytester.parseconfig("--checklist-collect=src"))
+    assert not is_disabled(pytester.parseconfig("--checklist-report"))
+    assert is_disabled(
+        pytester.parseconfig("--checklist-collect=src", "--checklist-disabled")
+    )
+
+
+@pointer(target=is_xdist_worker)
+def test_is_xdist_worker(pytester):
+
+    config = pytester.parseconfig()
+
+    assert not is_xdist_worker(config)
+
+    config.workerinput = {"workerid": "gw1"}
+
+    assert is_xdist_worker(config)
+
+
+@pointer(target=is_xdist_controller)
+def test_is_xdist_controller(pytester):
+
+    config = pytester.parseconfig()
+
+    assert not is_xdist_controller(config)
+
+    config.option.dist = "load"
+    config.option.numprocesses = 2
+
+    assert is_xdist_controller(config)
+
+    # the workers get the same options
+    config.workerinput = {"workerid": "gw0"}
+
+    assert not is_xdist_controller(config)
+
+
+@pointer(target=resolve_source)
+def test_resolve_source(project):
+
+    config = project.parseconfig(
+        "--checklist-collect=src/pkg",
+        "--checklist-exclude=b.py,a.py",
+        "--checklist-infer-search-module",
+    )
+
+    source_dir, exclude_patterns, search_path = resolve_source(config, project.path)
+
+    assert source_dir == project.path / "src/pkg"
+    assert exclude_patterns == ["a.py", "b.py"]
+    assert search_path == (project.path / "src").resolve()
+
+
+@pointer(target=resolve_targets)
+def test_resolve_targets(project):
+
+    def target_names(*args):
+        config = project.parseconfig(*CHECKLIST_ARGS, *args)
+        targets = resolve_targets(config, project.path, PointerIndex({}))
+        return {target.fq_name() for target in targets}
+
+    assert target_names() == {"pkg.mod.foo", "pkg.mod.bar"}
+
+    # from an inventory, which may be out of date
+    write_inventory(project.path / "inventory.json", scan(project.path / "src"))
+    project.path.joinpath("src/pkg/other.py").write_text("def baz():\n    pass\n")
+
+    assert target_names("--checklist-inventory=inventory.json") == {
+        "pkg.mod.foo",
+        "pkg.mod.bar",
+    }
+
+    # scanning when the inventory or daemon aren't there
+    with pytest.warns(UserWarning):
+        assert "pkg.other.baz" in target_names("--checklist-inventory=missing.json")
+
+    with pytest.warns(UserWarning):
+        assert "pkg.other.baz" in target_names("--checklist-daemon-socket=missing.sock")
+
+
+@pointer(target=collect_item_pointers)
+def test_partial_run(project):
+
+    run_checklist(project).assert_outcomes(passed=2)
+
+    # the pointers of the tests that didn't run are carried over
+    result = run_checklist(project, "tests/test_mod.py::test_foo")
+
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*1 tests not collected in this run*",
+            "*Checklist unit coverage passed!*",
+        ]
+    )
+
+
+@pointer(target=collect_item_pointers)
+def test_deselected_run(project):
+
+    # deselected tests are still collected so their pointers count
+    result = run_checklist(project, "-k", "test_foo")
+
+    result.assert_outcomes(passed=1, deselected=1)
+    result.stdout.fnmatch_lines(["*Checklist unit coverage passed!*"])
+    result.stdout.no_fnmatch_line("*not collected in this run*")
+
+
+@pointer(target=collect_item_pointers)
+def test_skipped_run(project):
+
+    # skipped tests never run so their pointers don't count
+    project.path.joinpath("tests/test_mod.py").write_text(
+        "import pytest\n\n"
+        "@pytest.mark.pointer('pkg.mod.foo')\n"
+        "def test_foo():\n    pass\n\n"
+        "@pytest.mark.skip\n"
+        "@pytest.mark.pointer('pkg.mod.bar')\n"
+        "def test_bar():\n    pass\n"
+    )
+
+    result = run_checklist(project)
+
+    result.assert_outcomes(passed=1, skipped=1)
+    result.stdout.fnmatch_lines(["*Checklist unit coverage failed*"])
+    assert result.ret != 0
+
+
+def test_update_baseline_without_baseline(project):
+
+    result = run_checklist(project, "--checklist-update-baseline")
+
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(["*--checklist-update-baseline needs*"])
+
+
+@pointer(target=collect_item_pointers)
+def test_stale_run(project):
+
+    run_checklist(project).assert_outcomes(passed=2)
+
+    # the pointers of deleted tests are dropped
+    project.path.joinpath("tests/test_mod.py").write_text(
+        "import pytest\n\n"
+        "@pytest.mark.pointer('pkg.mod.foo')\n"
+        "def test_foo():\n    pass\n"
+    )
+
+    result = run_checklist(project)
+
+    result.stdout.fnmatch_lines(
+        [
+            "*and dropped 1*",
+            "*Checklist unit coverage failed*",
+        ]
+    )
+    assert result.ret != 0
+
+
+@pointer(target=collect_item_pointers)
+def test_invalid_pointer_on_worker(project):
+
+    project.path.joinpath("tests/test_invalid.py").write_text(
+        "import pytest\n\n"
+        "@pytest.mark.pointer('not a name')\n"
+        "def test_invalid():\n    pass\n"
+    )
+
+    # like a second xdist worker, which doesn't record the pointers
+    project.makeconftest(
+        "def pytest_configure(config):\n"
+        "    config.workerinput = {'workerid': 'gw1'}\n"
+    )
+
+    result = run_checklist(project)
+
+    result.assert_outcomes(passed=2, errors=1)
+    assert not project.path.joinpath(".pytest_cache/v/checklist/targets").exists()
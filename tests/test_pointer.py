@@ -4,6 +4,7 @@ from pytest_checklist.pointer import (
     Pointer,
     resolve_pointer_mark_target,
     resolve_target_pointer,
+    find_unresolved_pointers,
 )
 
 pointer = pytest.mark.pointer
@@ -13,6 +14,21 @@ def func_target():
     pass
 
 
+def wrapped_target():
+    pass
+
+
+class WrappingDecorator:
+    def __init__(self, func):
+        self.__wrapped__ = func
+
+    def __call__(self):
+        return self.__wrapped__()
+
+
+decorated_target = WrappingDecorator(wrapped_target)
+
+
 class PropertyTarget:
     @property
     def property_target(self):
@@ -32,6 +48,20 @@ def test_resolve_target_pointer():
         "tests.test_pointer.PropertyTarget.property_target",
     )
 
+    assert resolve_target_pointer("tests.test_pointer.func_target") == Pointer(
+        "tests.test_pointer.func_target",
+        "tests.test_pointer.func_target",
+    )
+
+    # decorators returning new objects point to what they wrap
+    assert resolve_target_pointer(decorated_target) == Pointer(
+        decorated_target,
+        "tests.test_pointer.wrapped_target",
+    )
+
+    with pytest.raises(ValueError):
+        resolve_target_pointer("tests.test_pointer.func_target()")
+
 
 @pointer(target=resolve_pointer_mark_target)
 def test_resolve_pointer_mark_target():
@@ -60,3 +90,18 @@ def test_resolve_pointer_mark_target():
         func_target,
         "tests.test_pointer.func_target",
     )
+
+
+@pointer(target="pytest_checklist.pointer.find_unresolved_pointers")
+def test_find_unresolved_pointers():
+
+    assert find_unresolved_pointers(
+        ["a.foo", "a.missing", "b.other", "a.foo"],
+        {"a.foo", "a.bar"},
+    ) == ["a.missing", "b.other"]
+
+    assert find_unresolved_pointers(
+        ["a.alias", "a.missing"],
+        {"a.foo"},
+        resolve=lambda name: {"a.alias": "a.foo"}.get(name, name),
+    ) == ["a.missing"]
@@ -0,0 +1,78 @@
+import pytest
+
+from pytest_checklist.reconcile import (
+    ReconciledPointers,
+    nodeid_path,
+    reconcile_pointers,
+)
+
+pointer = pytest.mark.pointer
+
+
+@pointer(target=nodeid_path)
+def test_nodeid_path():
+
+    assert nodeid_path("tests/test_a.py::TestA::test_foo[1::2]") == "tests/test_a.py"
+    assert nodeid_path("tests/test_a.py") == "tests/test_a.py"
+
+
+@pointer(target=reconcile_pointers)
+def test_reconcile_pointers(tmp_path):
+
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests/test_a.py").write_text("")
+    (tmp_path / "tests/test_b.py").write_text("")
+    (tmp_path / "tests/test_c.py").write_text("")
+
+    stored = {
+        "mod.foo": [
+            # renamed within a collected file
+            "tests/test_a.py::test_old",
+            # file not collected this time
+            "tests/test_b.py::test_foo",
+            # file was deleted
+            "tests/test_gone.py::test_foo",
+        ],
+        # now points somewhere else
+        "mod.bar": ["tests/test_a.py::test_bar"],
+        # only part of the file was collected
+        "mod.baz": ["tests/test_c.py::test_baz"],
+    }
+
+    reconciled = reconcile_pointers(
+        stored,
+        {"mod.foo": {"tests/test_a.py::test_new", "tests/test_a.py::test_bar"}},
+        [
+            "tests/test_a.py::test_new",
+            "tests/test_a.py::test_bar",
+            "tests/test_a.py::test_nothing",
+            "tests/test_c.py::test_other",
+        ],
+        tmp_path,
+        partial_paths={"tests/test_c.py"},
+        last_seen={"tests/test_b.py::test_foo": 1.0},
+        timestamp=2.0,
+    )
+
+    assert reconciled == ReconciledPointers(
+        target_pointers={
+            "mod.foo": {
+                "tests/test_a.py::test_new",
+                "tests/test_a.py::test_bar",
+                "tests/test_b.py::test_foo",
+            },
+            "mod.baz": {"tests/test_c.py::test_baz"},
+        },
+        last_seen={
+            "tests/test_a.py::test_new": 2.0,
+            "tests/test_a.py::test_bar": 2.0,
+            "tests/test_b.py::test_foo": 1.0,
+            "tests/test_c.py::test_baz": 2.0,
+        },
+        fresh={"tests/test_a.py::test_new", "tests/test_a.py::test_bar"},
+        carried={"tests/test_b.py::test_foo", "tests/test_c.py::test_baz"},
+        stale={"tests/test_a.py::test_old", "tests/test_gone.py::test_foo"},
+    )
+
+    # nothing stored
+    assert reconcile_pointers({}, {}, [], tmp_path) == ReconciledPointers()
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pytest
+
+from pytest_checklist.app import TargetReport
+from pytest_checklist.collector import Module, Target, TargetResult
+from pytest_checklist.report import (
+    report_status,
+    is_shown,
+    iter_report_lines,
+    make_report,
+    paginate,
+    batched,
+)
+
+pointer = pytest.mark.pointer
+
+mod = Module(Path("nothing"), "a")
+
+PASSING = TargetReport(TargetResult(Target(mod, "passing"), 1), True)
+UNDER = TargetReport(TargetResult(Target(mod, "under"), 1), False)
+IGNORED = TargetReport(TargetResult(Target(mod, "ignored", ignored=True), 0), False)
+FAILING = TargetReport(TargetResult(Target(mod, "failing"), 0), False)
+
+
+@pointer(target=report_status)
+def test_report_status():
+
+    assert report_status(PASSING) == ("green", "PASS")
+    assert report_status(UNDER) == ("blue", "FAIL")
+    assert report_status(IGNORED) == ("yellow", "IGNORE")
+    assert report_status(FAILING) == ("red", "FAIL")
+
+
+@pointer(target=is_shown)
+def test_is_shown():
+
+    assert is_shown(FAILING)
+    assert not is_shown(PASSING)
+    assert not is_shown(IGNORED)
+    assert is_shown(PASSING, show_passing=True)
+    assert is_shown(IGNORED, show_ignored=True)
+
+
+@pointer(target=iter_report_lines)
+def test_iter_report_lines():
+
+    lines = iter_report_lines([PASSING, UNDER, IGNORED, FAILING])
+
+    assert [line.plain for line in lines] == [
+        "FAIL   1  a.under",
+        "FAIL   0  a.failing",
+    ]
+
+    (line,) = iter_report_lines([PASSING], show_passing=True)
+
+    assert line.plain == "PASS   1  a.passing"
+
+    timed = TargetReport(TargetResult(Target(mod, "timed"), 2, 0.25, 1.0), False)
+
+    assert [
+        line.plain for line in iter_report_lines([timed, FAILING], show_durations=True)
+    ] == [
+        "FAIL   2  a.timed (fastest test 0.250s)",
+        "FAIL   0  a.failing",
+    ]
+    assert line.spans[0].style == "green"
+
+
+@pointer(target=make_report)
+def test_make_report():
+
+    report = make_report([PASSING, UNDER, IGNORED, FAILING])
+
+    assert report.renderable.plain.splitlines() == [
+        "List of functions in project and the number of tests for them",
+        "",
+        "FAIL   1  a.under",
+        "FAIL   0  a.failing",
+    ]
+
+    assert make_report([PASSING]).renderable.plain == "All targets covered!"
+
+
+@pointer(target=paginate)
+def test_paginate():
+
+    assert list(paginate(range(5))) == [0, 1, 2, 3, 4]
+    assert list(paginate(range(5), limit=2)) == [0, 1]
+    assert list(paginate(range(5), limit=2, page=3)) == [4]
+    assert list(paginate(range(5), limit=2, page=4)) == []
+
+
+@pointer(target=batched)
+def test_batched():
+
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 2)) == []
@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import pytest
+
+from pytest_checklist.app import TargetReport
+from pytest_checklist.collector import Module, Target, TargetResult
+from pytest_checklist.rules import (
+    PassRule,
+    RuleMatcher,
+    iter_rule_reports,
+    literal_prefix,
+    parse_rule,
+)
+
+pointer = pytest.mark.pointer
+
+
+@pointer(target=parse_rule)
+def test_parse_rule():
+
+    assert parse_rule("pkg.api.* 2") == PassRule("pkg.api.*", 2)
+    assert parse_rule("  pkg.*   1 marker=unit ") == PassRule("pkg.*", 1, "unit")
+
+    for line in ["pkg.*", "pkg.* two", "pkg.* 1 unit", "pkg.* 1 marker=a b"]:
+        with pytest.raises(ValueError):
+            parse_rule(line)
+
+
+@pointer(target=literal_prefix)
+def test_literal_prefix():
+
+    assert literal_prefix("pkg.api.*") == "pkg.api."
+    assert literal_prefix("pkg.a?i.[ab]*") == "pkg.a"
+    assert literal_prefix("*.internal.*") == ""
+    assert literal_prefix("pkg.api.foo") == "pkg.api.foo"
+
+
+class TestRuleMatcher:
+
+    @pointer(target=RuleMatcher.match)
+    def test_match(self):
+
+        matcher = RuleMatcher(
+            [
+                PassRule("pkg.api.*", 2),
+                PassRule("pkg.*", 1, "unit"),
+                PassRule("*.test_?", 0),
+            ]
+        )
+
+        assert matcher.match("pkg.api.foo") == PassRule("pkg.api.*", 2)
+        assert matcher.match("pkg.apix.foo") == PassRule("pkg.*", 1, "unit")
+        assert matcher.match("other.test_a") == PassRule("*.test_?", 0)
+        assert matcher.match("other.test_ab") is None
+
+        # the rules starting with wildcards still go in order
+        matcher = RuleMatcher(
+            [
+                PassRule("*.api.*", 3),
+                PassRule("pkg.api.*", 2),
+                PassRule("*", 1),
+                PassRule("pkg.core", 0),
+            ]
+        )
+
+        assert matcher.match("pkg.api.foo") == PassRule("*.api.*", 3)
+        assert matcher.match("pkg.core") == PassRule("*", 1)
+        assert matcher.match("other") == PassRule("*", 1)
+
+        assert RuleMatcher([]).match("pkg.api.foo") is None
+
+    @pointer(target=RuleMatcher.markers)
+    def test_markers(self):
+
+        matcher = RuleMatcher(
+            [
+                PassRule("pkg.api.*", 2),
+                PassRule("pkg.*", 1, "unit"),
+                PassRule("other.*", 1, "unit"),
+            ]
+        )
+
+        assert matcher.markers() == {"unit"}
+
+
+@pointer(target=iter_rule_reports)
+def test_iter_rule_reports():
+
+    mod = Module(Path("nomatter"), "pkg.api")
+    results = [
+        TargetResult(Target(mod, "foo"), 1),
+        TargetResult(Target(mod, "bar"), 2),
+        TargetResult(Target(Module(Path(""), "pkg.core"), "baz"), 2),
+        TargetResult(Target(Module(Path(""), "other"), "quux"), 1),
+    ]
+
+    reports = iter_rule_reports(
+        results,
+        RuleMatcher([PassRule("pkg.api.*", 2), PassRule("pkg.*", 1, "unit")]),
+        1,
+        {"pkg.core.baz": ["test_a", "test_b"]},
+        {"test_b": ["unit"]},
+    )
+
+    assert list(reports) == [
+        TargetReport(results[0], passes=False),
+        TargetReport(results[1], passes=True),
+        TargetReport(results[2], passes=True),
+        TargetReport(results[3], passes=True),
+    ]
+
+    # only the pointers from tests with the marker count
+    assert not next(
+        iter_rule_reports(
+            results[2:3],
+            RuleMatcher([PassRule("pkg.*", 2, "unit")]),
+            1,
+            {"pkg.core.baz": ["test_a", "test_b"]},
+            {"test_b": ["unit"]},
+        )
+    ).passes